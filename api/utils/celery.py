@@ -1,9 +1,25 @@
+import asyncio
+from typing import Any, Awaitable, Optional
+
 from celery import Celery
+from celery.signals import worker_process_shutdown, worker_process_init
 from decouple import config
 
+# Registra os handlers de sinais que medem duração e retentativas das tasks
+import api.utils.metrics  # noqa: F401
+from api.utils.http_client import close_http_client
+from api.utils.redis_pool import close_redis, reset_redis
+from api.utils.tracing import TRACING_SERVICE_NAME, setup_tracing, shutdown_tracing
+
 
 REDIS_URL = config("REDIS_URL")
 
+# request: sincronização disparada pelas requisições | beat: apenas pelo agendamento do Celery beat
+CATALOG_SYNC_MODE = config("CATALOG_SYNC_MODE", default="request")
+# Somado ao CATALOG_SYNC_JITTER deve ficar abaixo do REDIS_TTL, ou o catálogo expira entre sincronizações
+CATALOG_SYNC_INTERVAL = config("CATALOG_SYNC_INTERVAL", default=240, cast=int)
+SCHEDULED_SYNC_ENABLED = CATALOG_SYNC_MODE == "beat"
+
 celery_app = Celery(
     "celery_tasks",
     broker=REDIS_URL,
@@ -11,4 +27,47 @@ celery_app = Celery(
     include=[
         'api.v1.fakestoreapi.services.background_task'
     ]
-)
\ No newline at end of file
+)
+
+if SCHEDULED_SYNC_ENABLED:
+    celery_app.conf.beat_schedule = {
+        "scheduled-catalog-sync": {
+            "task": "schedule_catalog_sync",
+            "schedule": CATALOG_SYNC_INTERVAL,
+        },
+    }
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def run_async(coro: Awaitable[Any]) -> Any:
+    """
+    Executa a corrotina no event loop persistente do processo do worker.
+
+    O Celery não suporta async/await diretamente; reutilizar o mesmo loop em
+    todas as tasks permite compartilhar o pool do Redis entre elas.
+    """
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop.run_until_complete(coro)
+
+
+@worker_process_init.connect
+def _init_worker_process(**kwargs):
+    # Depois do fork: conexões e a thread de exportação do tracing não são herdáveis
+    reset_redis()
+    setup_tracing(f"{TRACING_SERVICE_NAME}-worker")
+
+
+@worker_process_shutdown.connect
+def _shutdown_worker_process(**kwargs):
+    global _loop
+    if _loop is not None and not _loop.is_closed():
+        _loop.run_until_complete(close_http_client())
+        _loop.run_until_complete(close_redis())
+        _loop.close()
+    _loop = None
+    shutdown_tracing()
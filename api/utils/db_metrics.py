@@ -0,0 +1,206 @@
+import logging
+import random
+import time
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+from decouple import config
+from prometheus_client import REGISTRY, Histogram
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+DB_SLOW_QUERY_MS = config("DB_SLOW_QUERY_MS", default=200, cast=float)
+# Fração das consultas lentas registradas com parâmetros (podem conter dados pessoais)
+DB_SLOW_QUERY_PARAMS_SAMPLE_RATE = config("DB_SLOW_QUERY_PARAMS_SAMPLE_RATE", default=0.0, cast=float)
+# Acima deste número de consultas em uma requisição, registra um aviso (provável N+1). 0 desativa
+DB_MAX_QUERIES_PER_REQUEST = config("DB_MAX_QUERIES_PER_REQUEST", default=0, cast=int)
+
+QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Duração das consultas SQL",
+    ["operation"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "Consultas SQL executadas por requisição",
+    ["endpoint"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100),
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Espera para obter uma conexão do pool (inclui abrir uma conexão nova e o pre-ping)",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+
+class QueryCounter:
+    """Contagem de consultas de um escopo (requisição ou bloco de teste)."""
+
+    def __init__(self, parent: Optional["QueryCounter"] = None, collect_statements: bool = False):
+        # Escopos aninhados (teste > requisição) também somam no escopo externo
+        self.parent = parent
+        self.count = 0
+        self.duration = 0.0
+        # O SQL só é guardado quando pedido (assert_max_queries); nas requisições basta a contagem
+        self.statements: Optional[List[str]] = [] if collect_statements else None
+
+
+_current_counter: ContextVar[Optional[QueryCounter]] = ContextVar("db_query_counter", default=None)
+
+
+def _operation(statement: str) -> str:
+    return statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - conn.info["query_start_time"].pop()
+    QUERY_DURATION.labels(_operation(statement)).observe(duration)
+
+    counter = _current_counter.get()
+    while counter is not None:
+        counter.count += 1
+        counter.duration += duration
+        if counter.statements is not None:
+            counter.statements.append(statement)
+        counter = counter.parent
+
+    if duration * 1000 >= DB_SLOW_QUERY_MS:
+        if random.random() < DB_SLOW_QUERY_PARAMS_SAMPLE_RATE:
+            logging.warning(f"Consulta lenta ({duration * 1000:.1f} ms): {statement} | parâmetros: {parameters!r}")
+        else:
+            logging.warning(f"Consulta lenta ({duration * 1000:.1f} ms): {statement}")
+
+
+def _handle_error(exception_context):
+    # A consulta falhou: descarta o início registrado para não desalinhar a pilha
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+
+
+# Pool mais recente de cada engine, lido pelo PoolCollector
+_pools: Dict[str, "weakref.ref"] = {}
+
+
+class _InstrumentedPoolMixin:
+    """Mede a espera no checkout e expõe o pool para o PoolCollector."""
+    engine_label = "sync"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waiting = 0
+        # recreate() (dispose) cria um pool novo da mesma classe, que substitui o anterior
+        _pools[self.engine_label] = weakref.ref(self)
+
+    def connect(self):
+        self.waiting += 1
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            self.waiting -= 1
+            POOL_CHECKOUT_WAIT.labels(self.engine_label).observe(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    engine_label = "sync"
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    engine_label = "async"
+
+
+class PoolCollector(Collector):
+    """Estado dos pools lido no momento da coleta, sem custo nas requisições."""
+
+    def collect(self):
+        size = GaugeMetricFamily("db_pool_size", "Conexões fixas do pool", labels=["engine"])
+        checked_out = GaugeMetricFamily("db_pool_checked_out", "Conexões em uso", labels=["engine"])
+        overflow = GaugeMetricFamily("db_pool_overflow", "Conexões abertas além do pool_size", labels=["engine"])
+        waiting = GaugeMetricFamily("db_pool_waiting", "Checkouts aguardando uma conexão", labels=["engine"])
+        for label, ref in list(_pools.items()):
+            pool = ref()
+            if pool is None:
+                continue
+            size.add_metric([label], pool.size())
+            checked_out.add_metric([label], pool.checkedout())
+            # overflow() começa negativo (-pool_size) até o pool abrir todas as conexões fixas
+            overflow.add_metric([label], max(0, pool.overflow()))
+            waiting.add_metric([label], pool.waiting)
+        yield from (size, checked_out, overflow, waiting)
+
+
+REGISTRY.register(PoolCollector())
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Registra os hooks de tempo por consulta (para engines async, use engine.sync_engine)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class count_queries:
+    """
+    Conta as consultas executadas dentro do bloco (inclusive em tasks criadas nele).
+
+    Classe em vez de @contextmanager: roda em toda requisição e o gerador custa
+    alguns microssegundos a mais.
+    """
+    __slots__ = ("collect_statements", "counter", "_token")
+
+    def __init__(self, collect_statements: bool = False):
+        self.collect_statements = collect_statements
+
+    def __enter__(self) -> QueryCounter:
+        self.counter = QueryCounter(_current_counter.get(), self.collect_statements)
+        self._token = _current_counter.set(self.counter)
+        return self.counter
+
+    def __exit__(self, *exc_info) -> None:
+        _current_counter.reset(self._token)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int) -> Iterator[QueryCounter]:
+    """
+    Helper de teste para detectar N+1:
+
+        with assert_max_queries(2):
+            client.get("/api/v1/favorites")
+    """
+    with count_queries(collect_statements=True) as counter:
+        yield counter
+    if counter.count > max_queries:
+        statements = "\n".join(counter.statements)
+        raise AssertionError(
+            f"Esperado no máximo {max_queries} consultas, executadas {counter.count}:\n{statements}"
+        )
+
+
+_queries_per_endpoint: Dict[str, Histogram] = {}
+
+
+def observe_request(endpoint: str, counter: QueryCounter) -> None:
+    # Cache das séries por endpoint: labels() valida e monta a chave a cada chamada
+    histogram = _queries_per_endpoint.get(endpoint)
+    if histogram is None:
+        histogram = _queries_per_endpoint[endpoint] = QUERIES_PER_REQUEST.labels(endpoint)
+    histogram.observe(counter.count)
+    if DB_MAX_QUERIES_PER_REQUEST and counter.count > DB_MAX_QUERIES_PER_REQUEST:
+        logging.warning(
+            f"{endpoint} executou {counter.count} consultas "
+            f"(limite {DB_MAX_QUERIES_PER_REQUEST}), possível N+1"
+        )
@@ -3,8 +3,16 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sess
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker 
 
+from api.utils.db_metrics import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    instrument_engine,
+)
+
 
 DATABASE_URL = config("DATABASE_URL")
+# Log de todo SQL no stdout: apenas para depuração local
+DB_ECHO = config("DB_ECHO", default=False, cast=bool)
 
 # Criar engine assíncrono apenas se o DATABASE_URL contiver +asyncpg
 engine = None
@@ -13,12 +21,13 @@ AsyncSessionLocal = None
 if "+asyncpg" in DATABASE_URL:
     engine = create_async_engine(
         DATABASE_URL,
+        poolclass=InstrumentedAsyncQueuePool,
         pool_size=10,            
         max_overflow=40,
         pool_timeout=360,
         pool_recycle=3600,
         pool_pre_ping=True,
-        echo=True,
+        echo=DB_ECHO,
         connect_args={
             "server_settings": {
                 "timezone": "America/Sao_Paulo"
@@ -42,11 +51,13 @@ if "+psycopg2" not in SYNC_DATABASE_URL:
 
 sync_engine = create_engine(
     SYNC_DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
     pool_size=10,
     max_overflow=40,
     pool_timeout=360,
     pool_recycle=3600,
     pool_pre_ping=True,
+    echo=DB_ECHO,
     connect_args={"options": "-c timezone=America/Sao_Paulo"}
 )
 
@@ -57,6 +68,10 @@ SyncSessionLocal = sessionmaker(
     expire_on_commit=False
 )
 
+if engine is not None:
+    instrument_engine(engine.sync_engine)
+instrument_engine(sync_engine)
+
 
 async def get_db():
     if AsyncSessionLocal is None:
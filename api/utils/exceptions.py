@@ -19,12 +19,26 @@ def exception_404_NOT_FOUND(detail: str) -> HTTPException:
         detail=detail,
     )
 
+def exception_429_TOO_MANY_REQUESTS(detail: str, retry_after: int = 1) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=detail,
+        headers={"Retry-After": str(retry_after)},
+    )
+
 def exception_500_INTERNAL_SERVER_ERROR(detail: str) -> HTTPException:
     return HTTPException(
         status_code=500,
         detail=detail,
     )
 
+def exception_503_SERVICE_UNAVAILABLE(detail: str, retry_after: int = 1) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=detail,
+        headers={"Retry-After": str(retry_after)},
+    )
+
 def exception_403_FORBIDDEN(detail: str) -> HTTPException:
     return HTTPException(
         status_code=403,
@@ -0,0 +1,60 @@
+from typing import Optional
+
+import httpx
+from decouple import config
+
+
+HTTP_CONNECT_TIMEOUT = config("HTTP_CONNECT_TIMEOUT", default=3.0, cast=float)
+HTTP_READ_TIMEOUT = config("HTTP_READ_TIMEOUT", default=10.0, cast=float)
+HTTP_POOL_TIMEOUT = config("HTTP_POOL_TIMEOUT", default=5.0, cast=float)
+HTTP_MAX_CONNECTIONS = config("HTTP_MAX_CONNECTIONS", default=20, cast=int)
+HTTP_MAX_KEEPALIVE_CONNECTIONS = config("HTTP_MAX_KEEPALIVE_CONNECTIONS", default=10, cast=int)
+HTTP_KEEPALIVE_EXPIRY = config("HTTP_KEEPALIVE_EXPIRY", default=30.0, cast=float)
+
+# HTTP/2 só é habilitado quando o pacote h2 está instalado (httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_ENABLED = True
+except ImportError:
+    HTTP2_ENABLED = False
+
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Cria um cliente HTTP assíncrono com pool de conexões keep-alive.
+
+    O limite de conexões também limita a concorrência: quando todas estão em uso
+    as próximas requisições aguardam até HTTP_POOL_TIMEOUT por uma conexão livre.
+    """
+    return httpx.AsyncClient(
+        http2=HTTP2_ENABLED,
+        timeout=httpx.Timeout(
+            connect=HTTP_CONNECT_TIMEOUT,
+            read=HTTP_READ_TIMEOUT,
+            write=HTTP_READ_TIMEOUT,
+            pool=HTTP_POOL_TIMEOUT,
+        ),
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Retorna o cliente HTTP compartilhado durante a vida da aplicação."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+    return _client
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
@@ -0,0 +1,176 @@
+import os
+import time
+from typing import Dict, Tuple
+
+from celery.signals import task_failure, task_postrun, task_prerun, task_retry, worker_ready
+from decouple import config
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    multiprocess,
+    start_http_server,
+)
+
+from api.utils.db_metrics import count_queries, observe_request
+
+
+# Porta do servidor de métricas do worker Celery. 0 desativa
+CELERY_METRICS_PORT = config("CELERY_METRICS_PORT", default=0, cast=int)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Duração das requisições HTTP por rota",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Leituras dos caches de produtos e do usuário autenticado (principal)",
+    ["cache", "result"],
+)
+# Séries pré-criadas: o caminho quente não paga o labels() a cada leitura.
+# principal: hit no cache local do worker, redis_hit no 2º nível compartilhado
+CACHE_RESULTS: Dict[Tuple[str, str], Counter] = {
+    (cache, result): CACHE_REQUESTS.labels(cache, result)
+    for cache, results in (
+        ("product", ("hit", "miss", "error")),
+        ("catalog", ("hit", "miss", "error")),
+        ("principal", ("hit", "redis_hit", "miss", "error")),
+    )
+    for result in results
+}
+
+UPSTREAM_DURATION = Histogram(
+    "upstream_request_duration_seconds",
+    "Duração das chamadas à FakeStoreAPI",
+    ["endpoint"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+UPSTREAM_ERRORS = Counter(
+    "upstream_errors_total",
+    "Falhas nas chamadas à FakeStoreAPI",
+    ["endpoint", "reason"],
+)
+
+SINGLE_FLIGHT_CALLS = Counter(
+    "single_flight_calls_total",
+    "Chamadas do single-flight: leader executa a busca, coalesced reaproveita o resultado de outra",
+    ["name", "result"],
+)
+
+# livesum: com PROMETHEUS_MULTIPROC_DIR soma os processos vivos
+PASSWORD_HASH_IN_FLIGHT = Gauge(
+    "password_hash_in_flight",
+    "Operações de bcrypt em execução ou na fila",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_QUEUED = Gauge(
+    "password_hash_queued",
+    "Operações de bcrypt aguardando um worker livre",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_OPERATIONS = Counter(
+    "password_hash_operations_total",
+    "Operações de bcrypt por resultado (rejected: recusada com 429)",
+    ["result"],
+)
+
+CELERY_TASK_DURATION = Histogram(
+    "celery_task_duration_seconds",
+    "Duração das tasks do Celery",
+    ["task", "state"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+CELERY_TASK_RETRIES = Counter("celery_task_retries_total", "Retentativas das tasks do Celery", ["task"])
+CELERY_TASK_FAILURES = Counter("celery_task_failures_total", "Tasks do Celery que falharam", ["task"])
+
+
+def metrics_registry():
+    """
+    Registro a expor. Com vários processos (workers do uvicorn ou prefork do Celery)
+    defina PROMETHEUS_MULTIPROC_DIR para somar as métricas de todos eles.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+# Séries por (método, rota, status) já resolvidas; labels() custa ~2 µs por chamada
+_request_durations: Dict[Tuple[str, str, int], Histogram] = {}
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI puro: latência por rota e consultas SQL por requisição.
+
+    Usa o template da rota (/api/v1/products/{id}) para manter a cardinalidade
+    baixa; caminhos sem rota ficam como "unmatched".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            with count_queries() as counter:
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            key = (scope["method"], path, status)
+            histogram = _request_durations.get(key)
+            if histogram is None:
+                histogram = _request_durations[key] = HTTP_REQUEST_DURATION.labels(*key)
+            histogram.observe(duration)
+            observe_request(path, counter)
+
+
+_task_started_at: Dict[str, float] = {}
+
+
+@task_prerun.connect
+def _on_task_prerun(task_id=None, **kwargs):
+    _task_started_at[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _on_task_postrun(task_id=None, task=None, state=None, **kwargs):
+    started_at = _task_started_at.pop(task_id, None)
+    if started_at is not None:
+        CELERY_TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - started_at)
+
+
+@task_retry.connect
+def _on_task_retry(sender=None, **kwargs):
+    CELERY_TASK_RETRIES.labels(sender.name).inc()
+
+
+@task_failure.connect
+def _on_task_failure(sender=None, **kwargs):
+    CELERY_TASK_FAILURES.labels(sender.name).inc()
+
+
+@worker_ready.connect
+def _start_worker_metrics_server(**kwargs):
+    if CELERY_METRICS_PORT:
+        start_http_server(CELERY_METRICS_PORT, registry=metrics_registry())
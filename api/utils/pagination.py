@@ -0,0 +1,126 @@
+import base64
+import hashlib
+import hmac
+import json
+from datetime import datetime
+from typing import Any, Callable, Literal, Optional, Sequence, Tuple
+from uuid import UUID
+
+from decouple import config
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from api.utils.exceptions import exception_400_BAD_REQUEST
+from api.v1._shared.schemas import Page
+
+
+JWT_SECRET_KEY = str(config("JWT_SECRET_KEY")).strip()
+
+CountMode = Literal["estimate", "exact"]
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) de uma consulta, com os mesmos parâmetros dela."""
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kw)}"
+
+
+def _sign(payload: bytes) -> str:
+    digest = hmac.new(JWT_SECRET_KEY.encode(), payload, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest[:16]).decode().rstrip("=")
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    """Cursor opaco e assinado com a posição (created_at, id) do último item da página."""
+    payload = json.dumps({"c": created_at.isoformat(), "i": str(id)}, separators=(",", ":")).encode()
+    encoded = base64.urlsafe_b64encode(payload).decode().rstrip("=")
+    return f"{encoded}.{_sign(payload)}"
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        encoded, signature = cursor.split(".", 1)
+        payload = _b64decode(encoded)
+        if not hmac.compare_digest(signature, _sign(payload)):
+            raise ValueError("assinatura inválida")
+        data = json.loads(payload)
+        return datetime.fromisoformat(data["c"]), UUID(data["i"])
+
+    except Exception:
+        raise exception_400_BAD_REQUEST(detail="Cursor de paginação inválido")
+
+
+def apply_keyset(query: Select, model: Any, cursor: Optional[str], limit: int) -> Select:
+    """
+    Paginação por keyset em (created_at, id) decrescente: a página seguinte começa
+    logo após o cursor usando o índice composto, sem OFFSET.
+    """
+    if cursor:
+        created_at, id = decode_cursor(cursor)
+        query = query.where(tuple_(model.created_at, model.id) < tuple_(created_at, id))
+    return query.order_by(model.created_at.desc(), model.id.desc()).limit(limit)
+
+
+async def count_rows(
+    db: AsyncSession,
+    query: Select,
+    mode: Optional[CountMode],
+) -> Tuple[Optional[int], bool]:
+    """
+    Total de linhas da consulta filtrada (sem paginação) e se ele é estimado.
+
+    - estimate: linhas previstas pelo planner (EXPLAIN), sem percorrer a tabela
+    - exact: COUNT(*) da consulta filtrada, custo de uma segunda varredura
+    """
+    query = query.order_by(None)
+    if mode == "exact":
+        total = await db.scalar(select(func.count()).select_from(query.subquery()))
+        return total, False
+
+    if mode == "estimate":
+        plan = (await db.execute(Explain(query))).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"]), True
+
+    return None, False
+
+
+def build_page(
+    rows: Sequence[Any],
+    limit: int,
+    mapper: Callable[[Any], Any],
+    keyset: bool = True,
+    total: Optional[int] = None,
+    total_is_estimate: bool = False,
+) -> Page:
+    """
+    Monta o envelope a partir de uma consulta feita com limit + 1:
+    a linha extra só indica que existe próxima página.
+    """
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    cursor = None
+    if has_more and keyset:
+        cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    return Page(
+        items=[mapper(row) for row in rows],
+        has_more=has_more,
+        next_cursor=cursor,
+        total=total,
+        total_is_estimate=total_is_estimate,
+    )
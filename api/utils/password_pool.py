@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from decouple import config
+
+from api.utils.exceptions import exception_429_TOO_MANY_REQUESTS
+from api.utils.metrics import (
+    PASSWORD_HASH_IN_FLIGHT,
+    PASSWORD_HASH_OPERATIONS,
+    PASSWORD_HASH_QUEUED,
+)
+
+
+# bcrypt libera o GIL, então threads bastam para tirá-lo do event loop
+PASSWORD_HASH_WORKERS = config(
+    "PASSWORD_HASH_WORKERS", default=min(4, os.cpu_count() or 1), cast=int
+)
+# Operações aguardando um worker livre antes de responder 429
+PASSWORD_HASH_MAX_QUEUE = config(
+    "PASSWORD_HASH_MAX_QUEUE", default=PASSWORD_HASH_WORKERS * 8, cast=int
+)
+PASSWORD_HASH_RETRY_AFTER = config("PASSWORD_HASH_RETRY_AFTER", default=1, cast=int)
+
+
+class PasswordHasherPool:
+    """
+    Pool limitado de threads para o bcrypt (hash e verificação de senha).
+
+    Cada operação leva ~100-300 ms de CPU; executá-las no event loop congela
+    todas as outras requisições do worker. Quando o pool e a fila estão cheios
+    a requisição é recusada com 429 em vez de acumular latência.
+    """
+
+    def __init__(
+        self,
+        workers: int = PASSWORD_HASH_WORKERS,
+        max_queue: int = PASSWORD_HASH_MAX_QUEUE,
+    ):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._metrics = {
+            result: PASSWORD_HASH_OPERATIONS.labels(result)
+            for result in ("completed", "failed", "rejected")
+        }
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="bcrypt"
+            )
+        return self._executor
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queued": max(0, self.in_flight - self.workers),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+    def _set_in_flight(self, in_flight: int) -> None:
+        self.in_flight = in_flight
+        PASSWORD_HASH_IN_FLIGHT.set(in_flight)
+        PASSWORD_HASH_QUEUED.set(max(0, in_flight - self.workers))
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.in_flight >= self.workers + self.max_queue:
+            self.rejected += 1
+            self._metrics["rejected"].inc()
+            logging.info(f"Pool de senhas saturado ({self.in_flight} operações em andamento)")
+            raise exception_429_TOO_MANY_REQUESTS(
+                detail="Servidor ocupado, tente novamente em instantes",
+                retry_after=PASSWORD_HASH_RETRY_AFTER,
+            )
+
+        self._set_in_flight(self.in_flight + 1)
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_executor(), fn, *args)
+        except BaseException:
+            # Erros e cancelamentos não contam como concluídas
+            self.failed += 1
+            self._metrics["failed"].inc()
+            raise
+        finally:
+            self._set_in_flight(self.in_flight - 1)
+
+        self.completed += 1
+        self._metrics["completed"].inc()
+        return result
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_pool = PasswordHasherPool()
@@ -0,0 +1,121 @@
+import logging
+import math
+import time
+import uuid
+from typing import Awaitable, Callable, Optional
+
+from decouple import config
+from fastapi import Request
+from redis.asyncio import Redis
+
+from api.utils.exceptions import exception_429_TOO_MANY_REQUESTS
+from api.utils.redis_pool import RedisKeyspace
+
+
+RATE_LIMIT_ENABLED = config("RATE_LIMIT_ENABLED", default=True, cast=bool)
+# Só habilitar atrás de um proxy confiável, senão o cliente escolhe o próprio IP
+RATE_LIMIT_TRUST_FORWARDED = config("RATE_LIMIT_TRUST_FORWARDED", default=False, cast=bool)
+LOGIN_RATE_LIMIT_IP = config("LOGIN_RATE_LIMIT_IP", default=20, cast=int)
+LOGIN_RATE_LIMIT_IP_WINDOW = config("LOGIN_RATE_LIMIT_IP_WINDOW", default=60, cast=int)
+LOGIN_RATE_LIMIT_EMAIL = config("LOGIN_RATE_LIMIT_EMAIL", default=5, cast=int)
+LOGIN_RATE_LIMIT_EMAIL_WINDOW = config("LOGIN_RATE_LIMIT_EMAIL_WINDOW", default=300, cast=int)
+
+KeyFunc = Callable[[Request], Awaitable[Optional[str]]]
+
+
+class SlidingWindowRateLimiter(RedisKeyspace):
+    """
+    Limite de requisições por janela deslizante, guardado no Redis.
+
+    Cada tentativa é um membro de um sorted set com o timestamp como score;
+    a contagem é feita em um único round trip (MULTI/EXEC) e vale para todos
+    os workers. Se o Redis estiver indisponível a requisição é liberada.
+    """
+
+    def __init__(self, name: str, limit: int, window: int, client: Optional[Redis] = None):
+        super().__init__(f"ratelimit:{name}", client)
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self.rejected = 0
+
+    async def hit(self, identifier: str) -> Optional[int]:
+        """
+        Registra uma tentativa. Retorna None se ela está dentro do limite,
+        ou os segundos até a janela liberar uma nova tentativa (Retry-After).
+        """
+        key = self._get_key(identifier)
+        now = time.time()
+        member = f"{now}:{uuid.uuid4().hex}"
+        try:
+            async with self._get_redis().pipeline(transaction=True) as pipe:
+                pipe.zremrangebyscore(key, 0, now - self.window)
+                pipe.zadd(key, {member: now})
+                pipe.zcard(key)
+                pipe.zrange(key, 0, 0, withscores=True)
+                pipe.expire(key, self.window)
+                _, _, count, oldest, _ = await pipe.execute()
+
+            if count <= self.limit:
+                return None
+
+            # Tentativas recusadas não contam, senão o bloqueio nunca expiraria
+            await self._get_redis().zrem(key, member)
+            self.rejected += 1
+            oldest_at = oldest[0][1] if oldest else now
+            return max(1, math.ceil(oldest_at + self.window - now))
+
+        except Exception as e:
+            logging.info(f"Erro ao verificar rate limit {key} no Redis: {e}")
+            return None
+
+
+async def client_ip(request: Request) -> Optional[str]:
+    if RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else None
+
+
+def body_field(field: str) -> KeyFunc:
+    """Usa um campo do body JSON como chave (o body fica em cache no Request)."""
+    async def key_func(request: Request) -> Optional[str]:
+        try:
+            body = await request.json()
+        except Exception:
+            return None
+        value = body.get(field) if isinstance(body, dict) else None
+        return str(value).strip().lower() if value else None
+    return key_func
+
+
+def rate_limit(limiter: SlidingWindowRateLimiter, key_func: KeyFunc = client_ip):
+    """
+    Dependency reutilizável para limitar endpoints custosos:
+
+        @router.post("/login", dependencies=[Depends(rate_limit(limiter))])
+
+    Roda antes do handler, então tentativas bloqueadas não chegam ao banco nem ao bcrypt.
+    """
+    async def dependency(request: Request) -> None:
+        if not RATE_LIMIT_ENABLED:
+            return
+        identifier = await key_func(request)
+        if identifier is None:
+            return
+        retry_after = await limiter.hit(identifier)
+        if retry_after is not None:
+            raise exception_429_TOO_MANY_REQUESTS(
+                detail="Muitas tentativas, tente novamente mais tarde",
+                retry_after=retry_after,
+            )
+    return dependency
+
+
+login_ip_limiter = SlidingWindowRateLimiter(
+    "login:ip", LOGIN_RATE_LIMIT_IP, LOGIN_RATE_LIMIT_IP_WINDOW
+)
+login_email_limiter = SlidingWindowRateLimiter(
+    "login:email", LOGIN_RATE_LIMIT_EMAIL, LOGIN_RATE_LIMIT_EMAIL_WINDOW
+)
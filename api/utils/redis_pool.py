@@ -0,0 +1,104 @@
+from typing import Any, Optional
+
+from decouple import config
+from redis import Redis as SyncRedis
+from redis.asyncio import BlockingConnectionPool, Redis
+
+
+REDIS_URL = config("REDIS_URL")
+REDIS_MAX_CONNECTIONS = config("REDIS_MAX_CONNECTIONS", default=50, cast=int)
+# Espera por uma conexão livre quando o pool está no limite, antes de falhar
+REDIS_POOL_TIMEOUT = config("REDIS_POOL_TIMEOUT", default=5.0, cast=float)
+REDIS_SOCKET_TIMEOUT = config("REDIS_SOCKET_TIMEOUT", default=5.0, cast=float)
+REDIS_SOCKET_CONNECT_TIMEOUT = config("REDIS_SOCKET_CONNECT_TIMEOUT", default=3.0, cast=float)
+# Conexões ociosas há mais tempo que isso recebem um PING antes de serem reutilizadas
+REDIS_HEALTH_CHECK_INTERVAL = config("REDIS_HEALTH_CHECK_INTERVAL", default=30, cast=int)
+
+
+_client: Optional[Redis] = None
+_sync_client: Optional[SyncRedis] = None
+
+
+def create_redis() -> Redis:
+    """
+    Cria um cliente Redis assíncrono com pool de conexões limitado.
+
+    Com todas as conexões em uso, as próximas operações aguardam até
+    REDIS_POOL_TIMEOUT por uma conexão livre em vez de abrir conexões novas.
+    """
+    pool = BlockingConnectionPool.from_url(
+        REDIS_URL,
+        decode_responses=True,
+        max_connections=REDIS_MAX_CONNECTIONS,
+        timeout=REDIS_POOL_TIMEOUT,
+        socket_timeout=REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=REDIS_SOCKET_CONNECT_TIMEOUT,
+        health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+    )
+    # from_pool: o cliente passa a ser dono do pool e o desconecta no aclose()
+    return Redis.from_pool(pool)
+
+
+def get_redis() -> Redis:
+    """
+    Retorna o cliente Redis compartilhado do processo.
+
+    As conexões ficam presas ao event loop em que foram abertas: na API é o loop
+    do uvicorn, no Celery o loop persistente de cada processo (run_async).
+    """
+    global _client
+    if _client is None:
+        _client = create_redis()
+    return _client
+
+
+class RedisKeyspace:
+    """
+    Base dos componentes que guardam chaves sob um prefixo no Redis
+    (rate limit, versão dos tokens, cache de usuários).
+
+    O cliente é resolvido a cada operação: instâncias criadas no import do
+    módulo não abrem conexões nem ficam presas a um event loop.
+    """
+
+    def __init__(self, keyspace: str, client: Optional[Redis] = None):
+        self.keyspace = keyspace
+        # Sem cliente injetado usa o pool compartilhado do processo
+        self._redis = client
+
+    def _get_key(self, identifier: Any) -> str:
+        return f"{self.keyspace}:{identifier}"
+
+    def _get_redis(self) -> Redis:
+        return self._redis or get_redis()
+
+
+async def close_redis() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+
+
+def get_redis_sync() -> SyncRedis:
+    """Cliente síncrono compartilhado (locks das tasks do Celery)."""
+    global _sync_client
+    if _sync_client is None:
+        _sync_client = SyncRedis.from_url(
+            REDIS_URL,
+            max_connections=REDIS_MAX_CONNECTIONS,
+            socket_timeout=REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=REDIS_SOCKET_CONNECT_TIMEOUT,
+            health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+        )
+    return _sync_client
+
+
+def reset_redis() -> None:
+    """
+    Descarta os clientes sem fechá-los. Usado logo após o fork dos workers do
+    Celery: as conexões herdadas pertencem ao processo pai.
+    """
+    global _client, _sync_client
+    _client = None
+    _sync_client = None
@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from decouple import config
+from sqlalchemy import text
+
+from api.utils.db_services import AsyncSessionLocal, engine, sync_engine
+from api.utils.http_client import close_http_client
+from api.utils.password_pool import password_pool
+from api.utils.redis_pool import close_redis, get_redis
+from api.utils.tracing import shutdown_tracing
+from api.v1.fakestoreapi.services.catalog_index import CATALOG_INDEX_ENABLED, catalog_index
+from api.v1.fakestoreapi.use_case import ProductUseCase
+
+
+# Conexões abertas antes de liberar o worker (até o pool_size do engine ficam no pool). 0 desativa
+WARMUP_DB_CONNECTIONS = config("WARMUP_DB_CONNECTIONS", default=5, cast=int)
+WARMUP_REDIS_CONNECTIONS = config("WARMUP_REDIS_CONNECTIONS", default=5, cast=int)
+# Carrega o catálogo no Redis (e na foto em memória) antes de reportar pronto
+WARMUP_CATALOG = config("WARMUP_CATALOG", default=True, cast=bool)
+# Acima disso o worker é liberado mesmo sem concluir o aquecimento
+WARMUP_TIMEOUT = config("WARMUP_TIMEOUT", default=30.0, cast=float)
+
+
+class AppResources:
+    """
+    Recursos da aplicação ligados ao lifespan do FastAPI.
+
+    - startup: cria os pools e aquece conexões e catálogo em background;
+      /health responde 503 até o aquecimento terminar
+    - shutdown: encerra tasks e fecha pools HTTP, Redis e banco
+    """
+
+    def __init__(self):
+        self.ready = False
+        self._warmup_task: Optional[asyncio.Task] = None
+        # Só os nomes das etapas: /health é público e as mensagens de erro podem expor hosts e credenciais
+        self.warmup_failed_steps: List[str] = []
+        self.warmup_duration: Optional[float] = None
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "warmup_duration": self.warmup_duration,
+            "warmup_failed_steps": self.warmup_failed_steps,
+        }
+
+    async def startup(self) -> None:
+        # Pool de conexões do Redis compartilhado por todos os serviços do worker
+        get_redis()
+        # Mantém a foto do catálogo em memória atualizada via pub/sub
+        catalog_index.start()
+        self._warmup_task = asyncio.create_task(self._warm_up())
+
+    async def _warm_up(self) -> None:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(
+                    self._run_step("db", self._warm_db),
+                    self._run_step("redis", self._warm_redis),
+                ),
+                WARMUP_TIMEOUT,
+            )
+            # Depois das conexões: o catálogo usa o Redis e, em cache miss, o banco
+            if WARMUP_CATALOG:
+                remaining = max(0.0, WARMUP_TIMEOUT - (time.perf_counter() - start))
+                await asyncio.wait_for(self._run_step("catalog", self._warm_catalog), remaining)
+
+        except asyncio.TimeoutError:
+            self.warmup_failed_steps.append("timeout")
+            logging.warning(f"Aquecimento excedeu {WARMUP_TIMEOUT}s, liberando o worker mesmo assim")
+
+        finally:
+            # Falhas no aquecimento não impedem o worker de atender: o custo volta para as primeiras requisições
+            self.warmup_duration = round(time.perf_counter() - start, 3)
+            self.ready = True
+            logging.info(f"Aquecimento concluído em {self.warmup_duration}s")
+
+    async def _run_step(self, name: str, step: Callable[[], Awaitable[None]]) -> None:
+        try:
+            await step()
+        except Exception as e:
+            self.warmup_failed_steps.append(name)
+            logging.warning(f"Erro no aquecimento ({name}): {e}", exc_info=True)
+
+    async def _warm_db(self) -> None:
+        if engine is None or WARMUP_DB_CONNECTIONS <= 0:
+            return
+
+        async def open_connection():
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        # Em paralelo, para que cada uma ocupe uma conexão diferente do pool
+        await asyncio.gather(*(open_connection() for _ in range(WARMUP_DB_CONNECTIONS)))
+
+    async def _warm_redis(self) -> None:
+        if WARMUP_REDIS_CONNECTIONS <= 0:
+            return
+        redis = get_redis()
+        await asyncio.gather(*(redis.ping() for _ in range(WARMUP_REDIS_CONNECTIONS)))
+
+    async def _warm_catalog(self) -> None:
+        if AsyncSessionLocal is None:
+            return
+        async with AsyncSessionLocal() as db:
+            use_case = ProductUseCase(db)
+            # Cache miss: busca na FakeStoreAPI (ou no banco) e grava no Redis
+            if await use_case.list_cached() is None:
+                await use_case.list()
+        if CATALOG_INDEX_ENABLED:
+            await catalog_index.refresh()
+
+    async def shutdown(self) -> None:
+        if self._warmup_task is not None and not self._warmup_task.done():
+            self._warmup_task.cancel()
+            try:
+                await self._warmup_task
+            except asyncio.CancelledError:
+                pass
+        self._warmup_task = None
+        self.ready = False
+
+        await catalog_index.stop()
+        # Fecha o pool de conexões HTTP compartilhado com a FakeStoreAPI
+        await close_http_client()
+        await close_redis()
+        if engine is not None:
+            await engine.dispose()
+        sync_engine.dispose()
+        password_pool.shutdown()
+        shutdown_tracing()
+
+
+app_resources = AppResources()
@@ -9,14 +9,27 @@ from sqlalchemy import select
 from uuid import UUID
 
 from api.utils.db_services import get_db
-from api.utils.exceptions import exception_401_UNAUTHORIZED
+from api.utils.exceptions import exception_401_UNAUTHORIZED, exception_503_SERVICE_UNAVAILABLE
+from api.utils.password_pool import password_pool
+from api.utils.token_version import TokenVersionUnavailable, token_versions
+from api.utils.user_cache import user_cache
 from api.v1._shared.models import User
+from api.v1._shared.schemas import CurrentUser
 
 
 JWT_SECRET_KEY = str(config("JWT_SECRET_KEY")).strip()
 JWT_ALGORITHM = str(config("JWT_ALGORITHM")).strip()
 ACCESS_TOKEN_EXPIRE_MINUTES = int(config("ACCESS_TOKEN_EXPIRE_MINUTES"))
 REFRESH_TOKEN_EXPIRE_DAYS = int(config("REFRESH_TOKEN_EXPIRE_DAYS"))
+# Access tokens carregam as permissões e get_current_user dispensa o banco
+JWT_STATELESS_PRINCIPAL = config("JWT_STATELESS_PRINCIPAL", default=False, cast=bool)
+# Tokens sem o claim "ver" (emitidos antes do versionamento) não podem ser revogados:
+# são aceitos apenas até este instante (ISO 8601). Vazio: sempre recusados
+TOKEN_LEGACY_ACCEPT_UNTIL = config(
+    "TOKEN_LEGACY_ACCEPT_UNTIL",
+    default="",
+    cast=lambda value: datetime.fromisoformat(value).astimezone(timezone.utc) if value else None,
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/account/login")
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -28,6 +41,15 @@ def get_password_hash(password) -> str:
     return pwd_context.hash(password)
 
 
+# Versões para uso em handlers async: o bcrypt roda no pool e não bloqueia o event loop
+async def verify_password_async(plain_password, hashed_password) -> bool:
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password) -> str:
+    return await password_pool.run(get_password_hash, password)
+
+
 def create_access_token(data: dict) -> str:
     """Cria um access token."""
     to_encode = data.copy()
@@ -52,6 +74,49 @@ def create_refresh_token(data: dict) -> str:
     return encoded_jwt
 
 
+async def build_token_data(user) -> dict:
+    """Claims comuns aos tokens de acesso e refresh."""
+    # Sem versão o token não poderia ser revogado: melhor não emitir
+    try:
+        version = await token_versions.current(user.id)
+    except TokenVersionUnavailable:
+        raise exception_503_SERVICE_UNAVAILABLE(detail="Serviço de sessões indisponível, tente novamente")
+
+    token_data = {
+        "sub": str(user.id),
+        "email": user.email,
+        "name": user.name,
+        "ver": version,
+    }
+
+    if JWT_STATELESS_PRINCIPAL:
+        token_data["permissions"] = list(user.permissions or [])
+
+    return token_data
+
+
+async def revoke_tokens(user_id: UUID) -> None:
+    """Revoga os tokens emitidos para o usuário; sem o Redis responde 503 em vez de seguir."""
+    try:
+        await token_versions.bump(user_id)
+    except TokenVersionUnavailable:
+        raise exception_503_SERVICE_UNAVAILABLE(detail="Não foi possível revogar as sessões, tente novamente")
+
+
+async def is_token_revoked(payload: dict) -> bool:
+    """
+    Compara o claim "ver" com a versão atual do usuário no Redis.
+
+    - tokens sem o claim (emitidos antes do versionamento) só valem até TOKEN_LEGACY_ACCEPT_UNTIL
+    - versão desconhecida (chave removida por flush/eviction) conta como revogado
+    - Redis indisponível levanta TokenVersionUnavailable: quem chama decide como falhar fechado
+    """
+    if "ver" not in payload:
+        return TOKEN_LEGACY_ACCEPT_UNTIL is None or datetime.now(timezone.utc) >= TOKEN_LEGACY_ACCEPT_UNTIL
+    version = await token_versions.get(UUID(payload["sub"]))
+    return version is None or version != payload["ver"]
+
+
 def verify_refresh_token(token: str) -> dict:
     """Verifica se o refresh token é válido."""
     try:
@@ -88,15 +153,20 @@ async def authenticate_user(db: AsyncSession, email: str, senha: str) -> User:
     result = await db.execute(query)
     usuario = result.scalar_one_or_none()
     
-    if not usuario or not verify_password(senha, usuario.password):
+    if not usuario or not await verify_password_async(senha, usuario.password):
         return False
     return usuario
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db),
-) -> User:
-    """Retorna o usuário atual autenticado através do token JWT."""
+) -> CurrentUser:
+    """
+    Retorna o usuário atual autenticado através do token JWT.
+
+    Com JWT_STATELESS_PRINCIPAL o principal vem dos claims do token; caso contrário
+    é lido do cache de principals e o banco só é consultado em cache miss.
+    """
     credentials_exception = exception_401_UNAUTHORIZED(
         detail="Could not validate credentials",
     )
@@ -126,6 +196,30 @@ async def get_current_user(
         user_uuid = UUID(user_id)
     except (ValueError, TypeError):
         raise credentials_exception
+
+    try:
+        revoked = await is_token_revoked(payload)
+    except TokenVersionUnavailable:
+        # Sem como confirmar a versão, um token revogado passaria: falha fechado
+        raise exception_503_SERVICE_UNAVAILABLE(detail="Serviço de sessões indisponível, tente novamente")
+
+    if revoked:
+        raise exception_401_UNAUTHORIZED(
+            detail="Token revogado. Faça login novamente.",
+        )
+
+    # Modo stateless: o principal é montado direto dos claims, sem banco nem cache
+    if JWT_STATELESS_PRINCIPAL and "permissions" in payload and "ver" in payload:
+        return CurrentUser(
+            id=user_uuid,
+            name=payload.get("name", ""),
+            email=payload.get("email", ""),
+            permissions=payload["permissions"],
+        )
+
+    principal = await user_cache.get(user_uuid)
+    if principal:
+        return principal
     
     query = select(User).where(
         User.id == user_uuid,
@@ -136,5 +230,7 @@ async def get_current_user(
     
     if usuario is None:
         raise credentials_exception
-    
-    return usuario
+
+    principal = CurrentUser.model_validate(usuario)
+    await user_cache.set(principal)
+    return principal
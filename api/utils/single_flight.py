@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from decouple import config
+from redis.asyncio import Redis
+
+from api.utils.metrics import SINGLE_FLIGHT_CALLS
+
+
+SINGLE_FLIGHT_MODE = config("SINGLE_FLIGHT_MODE", default="local")  # local | redis
+SINGLE_FLIGHT_LOCK_TTL_MS = config("SINGLE_FLIGHT_LOCK_TTL_MS", default=10000, cast=int)
+SINGLE_FLIGHT_WAIT_TIMEOUT = config("SINGLE_FLIGHT_WAIT_TIMEOUT", default=5.0, cast=float)
+SINGLE_FLIGHT_POLL_INTERVAL = config("SINGLE_FLIGHT_POLL_INTERVAL", default=0.05, cast=float)
+
+# Remove o lock apenas se ele ainda pertencer a quem o criou
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class LeaderCancelled(Exception):
+    """O líder foi cancelado: os seguidores não foram, então tentam de novo."""
+
+
+class SingleFlight:
+    """
+    Garante que apenas uma execução por chave esteja em andamento.
+
+    - No mesmo processo, chamadas concorrentes aguardam o resultado do líder.
+    - No modo "redis", um lock distribuído elege um único líder entre os workers;
+      os demais aguardam o resultado aparecer no cache (wait_result).
+    """
+
+    def __init__(self, mode: str = SINGLE_FLIGHT_MODE, name: str = "default"):
+        self.mode = mode
+        self.name = name
+        # Execuções reais vs. chamadas atendidas pelo resultado de outra, por nome no /metrics
+        self._metrics = {
+            result: SINGLE_FLIGHT_CALLS.labels(name, result)
+            for result in ("leader", "coalesced", "remote_coalesced")
+        }
+        self._calls: Dict[str, asyncio.Future] = {}
+        self.leader_calls = 0
+        self.coalesced_calls = 0
+        self.remote_coalesced_calls = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "leader_calls": self.leader_calls,
+            "coalesced_calls": self.coalesced_calls,
+            "remote_coalesced_calls": self.remote_coalesced_calls,
+            "in_flight": len(self._calls),
+        }
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        redis: Optional[Redis] = None,
+        wait_result: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> Any:
+        call = self._calls.get(key)
+        if call is not None:
+            self.coalesced_calls += 1
+            self._metrics["coalesced"].inc()
+            try:
+                return await asyncio.shield(call)
+            except LeaderCancelled:
+                # Quando os seguidores acordam a chave já foi liberada: o primeiro vira o novo líder
+                return await self.do(key, fn, redis, wait_result)
+
+        future = asyncio.get_running_loop().create_future()
+        # Evita o aviso de "exception was never retrieved" quando não há seguidores
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._calls[key] = future
+        try:
+            result = await self._run(key, fn, redis, wait_result)
+            future.set_result(result)
+            return result
+
+        except asyncio.CancelledError:
+            # Cancelar o future propagaria o cancelamento para requisições que não foram canceladas
+            future.set_exception(LeaderCancelled())
+            raise
+
+        except Exception as e:
+            future.set_exception(e)
+            raise
+
+        finally:
+            self._calls.pop(key, None)
+
+    async def _run(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        redis: Optional[Redis],
+        wait_result: Optional[Callable[[], Awaitable[Any]]],
+    ) -> Any:
+        if self.mode != "redis" or redis is None:
+            self.leader_calls += 1
+            self._metrics["leader"].inc()
+            return await fn()
+
+        lock_key = f"singleflight:{key}"
+        token = uuid.uuid4().hex
+        try:
+            acquired = await redis.set(lock_key, token, nx=True, px=SINGLE_FLIGHT_LOCK_TTL_MS)
+        except Exception as e:
+            logging.info(f"Erro ao obter lock {lock_key} no Redis: {e}")
+            acquired = True
+            token = None
+
+        if acquired:
+            self.leader_calls += 1
+            self._metrics["leader"].inc()
+            try:
+                return await fn()
+            finally:
+                if token:
+                    await self._release(redis, lock_key, token)
+
+        # Outro worker é o líder: aguarda o resultado ser publicado no cache
+        if wait_result is not None:
+            deadline = time.monotonic() + SINGLE_FLIGHT_WAIT_TIMEOUT
+            while time.monotonic() < deadline:
+                await asyncio.sleep(SINGLE_FLIGHT_POLL_INTERVAL)
+                # Lê o lock antes do cache: se já foi liberado, o resultado já foi gravado
+                try:
+                    lock_held = bool(await redis.exists(lock_key))
+                except Exception:
+                    lock_held = False
+
+                result = await wait_result()
+                if result:
+                    self.remote_coalesced_calls += 1
+                    self._metrics["remote_coalesced"].inc()
+                    return result
+                if not lock_held:
+                    break
+
+        # O líder falhou ou demorou demais, então esta chamada busca por conta própria
+        self.leader_calls += 1
+        self._metrics["leader"].inc()
+        return await fn()
+
+    async def _release(self, redis: Redis, lock_key: str, token: str) -> None:
+        try:
+            await redis.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+        except Exception as e:
+            logging.info(f"Erro ao liberar lock {lock_key} no Redis: {e}")
@@ -0,0 +1,73 @@
+import logging
+import time
+from typing import Optional
+from uuid import UUID
+
+from redis.asyncio import Redis
+
+from api.utils.redis_pool import RedisKeyspace
+
+
+class TokenVersionUnavailable(Exception):
+    """O Redis não respondeu: a versão vigente não pode ser confirmada."""
+
+
+def _initial_version() -> int:
+    # Versão inicial derivada do relógio (ms): se a chave sumir (flush, eviction), a
+    # nova versão é maior que qualquer outra já emitida e tokens antigos não voltam a valer
+    return int(time.time() * 1000)
+
+
+class TokenVersionStore(RedisKeyspace):
+    """
+    Versão dos tokens de cada usuário, guardada no Redis.
+
+    Os tokens carregam a versão vigente no claim "ver"; incrementar a versão
+    (logout, troca de permissões/senha, exclusão) revoga todos os tokens emitidos
+    antes, com uma única leitura O(1) por requisição.
+
+    Falhas do Redis levantam TokenVersionUnavailable em vez de presumir uma versão.
+    """
+
+    def __init__(self, client: Optional[Redis] = None):
+        super().__init__("token_version", client)
+
+    async def get(self, user_id: UUID) -> Optional[int]:
+        """Versão atual, ou None se a chave não existe (versão desconhecida)."""
+        try:
+            version = await self._get_redis().get(self._get_key(user_id))
+            return int(version) if version else None
+
+        except Exception as e:
+            logging.error(f"Erro ao buscar versão do token do usuário {user_id}: {e}")
+            raise TokenVersionUnavailable() from e
+
+    async def current(self, user_id: UUID) -> int:
+        """Versão para novos tokens: cria a chave se ainda não existir."""
+        key = self._get_key(user_id)
+        try:
+            async with self._get_redis().pipeline(transaction=True) as pipe:
+                pipe.set(key, _initial_version(), nx=True)
+                pipe.get(key)
+                _, version = await pipe.execute()
+            return int(version)
+
+        except Exception as e:
+            logging.error(f"Erro ao obter versão do token do usuário {user_id}: {e}")
+            raise TokenVersionUnavailable() from e
+
+    async def bump(self, user_id: UUID) -> int:
+        key = self._get_key(user_id)
+        try:
+            async with self._get_redis().pipeline(transaction=True) as pipe:
+                pipe.set(key, _initial_version(), nx=True)
+                pipe.incr(key)
+                _, version = await pipe.execute()
+            return version
+
+        except Exception as e:
+            logging.error(f"Erro ao revogar tokens do usuário {user_id}: {e}")
+            raise TokenVersionUnavailable() from e
+
+
+token_versions = TokenVersionStore()
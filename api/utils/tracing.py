@@ -0,0 +1,135 @@
+import logging
+from contextlib import nullcontext
+from typing import Any, ContextManager, Optional
+
+from decouple import config
+
+# O OpenTelemetry é opcional: sem opentelemetry-sdk instalado o tracing fica desligado
+try:
+    from opentelemetry import trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    TRACING_AVAILABLE = True
+except ImportError:
+    TRACING_AVAILABLE = False
+
+
+TRACING_ENABLED = config("TRACING_ENABLED", default=False, cast=bool)
+TRACING_SERVICE_NAME = config("TRACING_SERVICE_NAME", default="fakestoreapi")
+# Fração dos traces iniciados aqui que são gravados; spans filhos (inclusive nas tasks) seguem o pai
+TRACING_SAMPLE_RATIO = config("TRACING_SAMPLE_RATIO", default=0.1, cast=float)
+# otlp: coletor OTLP/HTTP | file: um span JSON por linha (testes e depuração local)
+TRACING_EXPORTER = config("TRACING_EXPORTER", default="otlp")
+TRACING_OTLP_ENDPOINT = config("TRACING_OTLP_ENDPOINT", default="http://localhost:4318/v1/traces")
+TRACING_FILE_PATH = config("TRACING_FILE_PATH", default="traces.jsonl")
+# Spans aguardando exportação; acima disso são descartados em vez de acumular memória
+TRACING_MAX_QUEUE_SIZE = config("TRACING_MAX_QUEUE_SIZE", default=2048, cast=int)
+
+
+_tracer = None
+
+
+def _create_exporter():
+    if TRACING_EXPORTER == "file":
+        return ConsoleSpanExporter(
+            out=open(TRACING_FILE_PATH, "a", encoding="utf-8"),
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    return OTLPSpanExporter(endpoint=TRACING_OTLP_ENDPOINT)
+
+
+def _instrument_libraries() -> None:
+    """Instrumenta Redis, SQLAlchemy, httpx e Celery; cada pacote de instrumentação é opcional."""
+    from api.utils.db_services import engine, sync_engine
+
+    try:
+        from opentelemetry.instrumentation.redis import RedisInstrumentor
+        RedisInstrumentor().instrument()
+    except ImportError:
+        logging.info("opentelemetry-instrumentation-redis não instalado")
+
+    try:
+        from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+        engines = [sync_engine] + ([engine.sync_engine] if engine is not None else [])
+        SQLAlchemyInstrumentor().instrument(engines=engines)
+    except ImportError:
+        logging.info("opentelemetry-instrumentation-sqlalchemy não instalado")
+
+    try:
+        from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+        HTTPXClientInstrumentor().instrument()
+    except ImportError:
+        logging.info("opentelemetry-instrumentation-httpx não instalado")
+
+    try:
+        # Na API injeta o contexto no .delay(); no worker o extrai, ligando a task ao trace da requisição
+        from opentelemetry.instrumentation.celery import CeleryInstrumentor
+        CeleryInstrumentor().instrument()
+    except ImportError:
+        logging.info("opentelemetry-instrumentation-celery não instalado")
+
+
+def setup_tracing(service_name: str = TRACING_SERVICE_NAME) -> bool:
+    """
+    Configura o provider global e as instrumentações, uma vez por processo.
+
+    No Celery deve rodar em cada processo filho (worker_process_init): a thread
+    de exportação do BatchSpanProcessor não sobrevive ao fork.
+    """
+    global _tracer
+    if _tracer is not None:
+        return True
+    if not TRACING_ENABLED:
+        return False
+    if not TRACING_AVAILABLE:
+        logging.warning("TRACING_ENABLED está ativo, mas o opentelemetry-sdk não está instalado")
+        return False
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": service_name}),
+        sampler=ParentBased(TraceIdRatioBased(TRACING_SAMPLE_RATIO)),
+    )
+    provider.add_span_processor(
+        BatchSpanProcessor(_create_exporter(), max_queue_size=TRACING_MAX_QUEUE_SIZE)
+    )
+    trace.set_tracer_provider(provider)
+    _instrument_libraries()
+    _tracer = trace.get_tracer("api")
+    return True
+
+
+def instrument_app(app: Any) -> None:
+    """Spans das requisições HTTP (health e metrics ficam de fora)."""
+    if _tracer is None:
+        return
+    try:
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+        # Sem os spans internos de send/receive do ASGI: um por mensagem, sem informação útil
+        FastAPIInstrumentor.instrument_app(
+            app, excluded_urls="health,metrics", exclude_spans=["send", "receive"]
+        )
+    except ImportError:
+        logging.info("opentelemetry-instrumentation-fastapi não instalado")
+
+
+def shutdown_tracing() -> None:
+    """Exporta os spans pendentes antes de encerrar o processo."""
+    if _tracer is not None:
+        trace.get_tracer_provider().shutdown()
+
+
+def start_span(name: str, **attributes: Any) -> ContextManager[Optional[Any]]:
+    """
+    Span de uma etapa da aplicação:
+
+        with start_span("product.cache", product_id=id):
+            ...
+
+    Com o tracing desligado é um nullcontext, sem custo relevante.
+    """
+    if _tracer is None:
+        return nullcontext()
+    return _tracer.start_as_current_span(name, attributes=attributes)
@@ -0,0 +1,104 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+from uuid import UUID
+
+from decouple import config
+from redis.asyncio import Redis
+
+from api.v1._shared.schemas import CurrentUser
+from api.utils.metrics import CACHE_RESULTS
+from api.utils.redis_pool import RedisKeyspace
+
+
+# TTL curto: invalidações só chegam ao cache local do próprio worker
+USER_CACHE_TTL = config("USER_CACHE_TTL", default=30, cast=int)
+USER_CACHE_MAX_SIZE = config("USER_CACHE_MAX_SIZE", default=10000, cast=int)
+USER_CACHE_REDIS_ENABLED = config("USER_CACHE_REDIS_ENABLED", default=False, cast=bool)
+USER_CACHE_REDIS_TTL = config("USER_CACHE_REDIS_TTL", default=300, cast=int)
+
+
+class UserPrincipalCache(RedisKeyspace):
+    """
+    Cache do usuário autenticado por id, para que get_current_user não consulte
+    o banco a cada requisição.
+
+    - 1º nível: LRU em memória com TTL, por processo
+    - 2º nível (opcional): Redis, compartilhado entre os workers
+    """
+
+    def __init__(self, client: Optional[Redis] = None):
+        super().__init__("principal", client)
+        self._items: "OrderedDict[str, tuple[float, CurrentUser]]" = OrderedDict()
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.redis_hits + self.misses
+        return {
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits + self.redis_hits) / total if total else 0.0,
+            "size": len(self._items),
+        }
+
+    async def get(self, user_id: UUID) -> Optional[CurrentUser]:
+        key = self._get_key(user_id)
+        item = self._items.get(key)
+        if item:
+            expires_at, user = item
+            if time.monotonic() < expires_at:
+                self._items.move_to_end(key)
+                self.hits += 1
+                CACHE_RESULTS["principal", "hit"].inc()
+                return user
+            del self._items[key]
+
+        if USER_CACHE_REDIS_ENABLED:
+            try:
+                user_json = await self._get_redis().get(key)
+                if user_json:
+                    user = CurrentUser.model_validate_json(user_json)
+                    self._set_local(key, user)
+                    self.redis_hits += 1
+                    CACHE_RESULTS["principal", "redis_hit"].inc()
+                    return user
+            except Exception as e:
+                CACHE_RESULTS["principal", "error"].inc()
+                logging.info(f"Erro ao buscar usuário {user_id} no Redis: {e}")
+
+        self.misses += 1
+        CACHE_RESULTS["principal", "miss"].inc()
+        return None
+
+    async def set(self, user: CurrentUser) -> None:
+        key = self._get_key(user.id)
+        self._set_local(key, user)
+
+        if USER_CACHE_REDIS_ENABLED:
+            try:
+                await self._get_redis().set(key, user.model_dump_json(), ex=USER_CACHE_REDIS_TTL)
+            except Exception as e:
+                logging.info(f"Erro ao salvar usuário {user.id} no Redis: {e}")
+
+    async def invalidate(self, user_id: UUID) -> None:
+        key = self._get_key(user_id)
+        self._items.pop(key, None)
+
+        if USER_CACHE_REDIS_ENABLED:
+            try:
+                await self._get_redis().delete(key)
+            except Exception as e:
+                logging.info(f"Erro ao remover usuário {user_id} do Redis: {e}")
+
+    def _set_local(self, key: str, user: CurrentUser) -> None:
+        self._items[key] = (time.monotonic() + USER_CACHE_TTL, user)
+        self._items.move_to_end(key)
+        while len(self._items) > USER_CACHE_MAX_SIZE:
+            self._items.popitem(last=False)
+
+
+user_cache = UserPrincipalCache()
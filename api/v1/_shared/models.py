@@ -9,18 +9,27 @@ from sqlalchemy import (
     ARRAY,
     Boolean,
     Column,
+    Computed,
     DateTime, 
     String,
     Float,
     Integer,
+    Index,
     Text,
     ForeignKey
 )
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
-from sqlalchemy.orm import  declarative_base, relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID as PG_UUID
+from sqlalchemy.orm import  declarative_base, deferred, relationship
 
 
 Base = declarative_base()
+
+# Documento da busca textual de produtos: título pesa mais que categoria e descrição
+PRODUCT_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(category, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
 tz = pytz.timezone('America/Sao_Paulo')
 logger = logging.getLogger(__name__)
 
@@ -54,7 +63,7 @@ class User(BaseModel):
 class Product(BaseModel):
     __tablename__ = 'product' 
     
-    id_api = Column(Integer, nullable=False, index=True)
+    id_api = Column(Integer, nullable=False, index=True, unique=True)
     title = Column(String(255), nullable=False)
     price = Column(Float, nullable=False)
     description = Column(Text, nullable=False)
@@ -62,6 +71,10 @@ class Product(BaseModel):
     image = Column(String(255), nullable=False)
     rate = Column(Float, nullable=False)
     count = Column(Integer, nullable=False)
+    # sha256 dos campos vindos da API externa, usado para pular linhas sem alteração
+    content_hash = Column(String(64), nullable=True)
+    # Coluna gerada pelo banco; deferred para não trafegar nas consultas comuns
+    search_vector = deferred(Column(TSVECTOR, Computed(PRODUCT_SEARCH_VECTOR, persisted=True)))
 
     favorites = relationship('Favorite', back_populates='product')
 
@@ -73,5 +86,53 @@ class Favorite(BaseModel):
     product_id = Column(PG_UUID(as_uuid=True), ForeignKey('product.id'), nullable=False)
     review = Column(Text, nullable=False)
     
-    user = relationship('User', back_populates='favorites', lazy='selectin')
-    product = relationship('Product', back_populates='favorites', lazy='selectin')
\ No newline at end of file
+    # Leituras usam a consulta projetada de FavoriteService; carregar as
+    # entidades completas por aqui passa a ser um erro explícito
+    user = relationship('User', back_populates='favorites', lazy='raise')
+    product = relationship('Product', back_populates='favorites', lazy='raise')
+
+
+# Índices da paginação por keyset em (created_at, id) decrescente. Parciais: as
+# listagens sempre filtram flg_deleted = false
+Index(
+    'ix_user_created_at_id',
+    User.created_at.desc(),
+    User.id.desc(),
+    postgresql_where=User.flg_deleted == False,
+)
+Index(
+    'ix_favorite_created_at_id',
+    Favorite.created_at.desc(),
+    Favorite.id.desc(),
+    postgresql_where=Favorite.flg_deleted == False,
+)
+Index(
+    'ix_favorite_user_id_created_at_id',
+    Favorite.user_id,
+    Favorite.created_at.desc(),
+    Favorite.id.desc(),
+    postgresql_where=Favorite.flg_deleted == False,
+)
+# Um favorito ativo por (user_id, product_id)
+Index(
+    'ix_favorite_user_id_product_id',
+    Favorite.user_id,
+    Favorite.product_id,
+    unique=True,
+    postgresql_where=Favorite.flg_deleted == False,
+)
+
+# Busca: GIN no tsvector e trigram no título (busca ranqueada) e trigram na review (review__ilike)
+Index('ix_product_search_vector', Product.search_vector, postgresql_using='gin')
+Index(
+    'ix_product_title_trgm',
+    Product.title,
+    postgresql_using='gin',
+    postgresql_ops={'title': 'gin_trgm_ops'},
+)
+Index(
+    'ix_favorite_review_trgm',
+    Favorite.review,
+    postgresql_using='gin',
+    postgresql_ops={'review': 'gin_trgm_ops'},
+)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Generic, List, Optional, TypeVar
 from uuid import UUID
 
 from fastapi_filter.contrib.sqlalchemy import Filter
@@ -13,6 +13,7 @@ from api.v1._shared.models import (
     get_permissions,
 )
 
+T = TypeVar("T")
 
 
 class CustomBaseModel(BaseModel):
@@ -62,6 +63,17 @@ class UserResponse(BaseModel):
     updated_at: datetime
 
 
+class CurrentUser(CustomBaseModel):
+    """Usuário autenticado, sem senha, usado como principal das requisições."""
+    id: UUID
+    name: str
+    email: str
+    permissions: List[str]
+    # Ausentes quando o principal vem apenas dos claims do token
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
 class UserDelete(BaseModel):
     id: UUID
     password: str
@@ -186,6 +198,17 @@ class FavoriteResponse(BaseModel):
     review: Optional[str] = None
 
 
+class Page(BaseModel, Generic[T]):
+    """Envelope das listagens paginadas."""
+    items: List[T]
+    has_more: bool
+    # Cursor da próxima página (apenas com a ordenação padrão)
+    next_cursor: Optional[str] = None
+    # Preenchido só quando solicitado via count=estimate|exact
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+
+
 class FavoriteDelete(BaseModel):
     id: UUID
 
@@ -1,16 +1,22 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.utils.db_services import get_db
 from api.utils.exceptions import (
     exception_500_INTERNAL_SERVER_ERROR,
 )
+from api.utils.rate_limit import (
+    body_field,
+    login_email_limiter,
+    login_ip_limiter,
+    rate_limit,
+)
 from api.utils.security import get_current_user
-from api.v1._shared.models import User
 from api.v1._shared.schemas import (
     AccountCreate,
     AccountLogin,
     AccountResponse,
+    CurrentUser,
     RefreshTokenRequest,
     RefreshTokenResponse,
     TokenResponse,
@@ -48,7 +54,11 @@ async def register(
 @router.post(
     "/login",
     response_model=TokenResponse,
-    summary="Fazer login"
+    summary="Fazer login",
+    dependencies=[
+        Depends(rate_limit(login_ip_limiter)),
+        Depends(rate_limit(login_email_limiter, body_field("email"))),
+    ],
 )
 async def login(
     data: AccountLogin,
@@ -65,6 +75,9 @@ async def login(
         token_response = await use_case.login(data=data)
         return token_response
     
+    except HTTPException:
+        raise
+
     except Exception as e:
         raise exception_500_INTERNAL_SERVER_ERROR(
             f"Erro interno ao fazer login: {str(e)}"
@@ -90,19 +103,46 @@ async def refresh_token(
         refresh_response = await use_case.refresh_token(data=data)
         return refresh_response
     
+    except HTTPException:
+        raise
+
     except Exception as e:
         raise exception_500_INTERNAL_SERVER_ERROR(
             f"Erro interno ao renovar token: {str(e)}"
         )
 
 
+@router.post(
+    "/logout",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Encerrar sessões do usuário autenticado"
+)
+async def logout(
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Revogar todos os tokens de acesso e refresh emitidos para o usuário.
+    """
+    try:
+        use_case = AccountUseCase(db)
+        await use_case.logout(current_user)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise exception_500_INTERNAL_SERVER_ERROR(
+            f"Erro interno ao fazer logout: {str(e)}"
+        )
+
+
 @router.get(
     "/me",
     response_model=AccountResponse,
     summary="Obter perfil do usuário autenticado"
 )
 async def get_me(
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
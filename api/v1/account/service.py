@@ -10,12 +10,17 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.utils.exceptions import (
     exception_401_UNAUTHORIZED,
+    exception_503_SERVICE_UNAVAILABLE,
 )
 from api.utils.security import (
+    build_token_data,
     create_access_token,
     create_refresh_token,
+    is_token_revoked,
+    revoke_tokens,
     verify_refresh_token,
 )
+from api.utils.token_version import TokenVersionUnavailable
 from api.v1._shared.schemas import (
     AccountLogin,
     UserResponse,
@@ -63,11 +68,7 @@ class AccountService:
         user = await self.user_service.get_user_by_email(data.email, data.password)
         
         # Povoar dados do token
-        token_data = {
-            "sub": str(user.id), 
-            "email": user.email,
-            "name": user.name
-        }
+        token_data = await build_token_data(user)
 
         # Gerar tokens
         access_token = create_access_token(token_data)
@@ -90,17 +91,21 @@ class AccountService:
         payload = verify_refresh_token(refresh_token)
         user_id = payload.get("sub") 
 
+        try:
+            revoked = await is_token_revoked(payload)
+        except TokenVersionUnavailable:
+            raise exception_503_SERVICE_UNAVAILABLE(detail="Serviço de sessões indisponível, tente novamente")
+
+        if revoked:
+            raise exception_401_UNAUTHORIZED(detail="Token revogado")
+
         user = await self.user_service.get(UUID(user_id))
 
         if not user:
             raise exception_401_UNAUTHORIZED(detail="Token inválido")
 
         # Povoar dados do token
-        token_data = {
-            "sub": str(user.id), 
-            "email": user.email,
-            "name": user.name
-        }
+        token_data = await build_token_data(user)
 
         # Gerar novos tokens
         access_token = create_access_token(token_data)
@@ -112,4 +117,9 @@ class AccountService:
             token_type="bearer",
             expires_in=int(ACCESS_TOKEN_EXPIRE_MINUTES) * 60,
         )
-    
\ No newline at end of file
+
+    async def logout(self, user_id: UUID) -> None:
+        """
+        Revogar todos os tokens (acesso e refresh) emitidos para o usuário.
+        """
+        await revoke_tokens(user_id)
@@ -11,7 +11,7 @@ from api.v1._shared.schemas import (
 )
 from api.v1.account.service import AccountService
 from api.v1.account.mapper import mapper_account_create_to_user_create, mapper_user_to_account_response
-from api.v1._shared.models import User
+from api.v1._shared.schemas import CurrentUser
 
 class AccountUseCase:
     
@@ -28,5 +28,11 @@ class AccountUseCase:
     async def refresh_token(self, data: RefreshTokenRequest) -> RefreshTokenResponse:
         return await self.service.refresh_token(data.refresh_token)
     
-    async def get_me(self, current_user: User) -> AccountResponse:
-        return mapper_user_to_account_response(current_user)
\ No newline at end of file
+    async def logout(self, current_user: CurrentUser) -> None:
+        await self.service.logout(current_user.id)
+    
+    async def get_me(self, current_user: CurrentUser) -> AccountResponse:
+        # Principal montado dos claims do token não traz as datas: busca no banco
+        if current_user.created_at is None:
+            current_user = await self.service.user_service.get(current_user.id)
+        return mapper_user_to_account_response(current_user)
@@ -1,14 +1,21 @@
-from typing import List
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, Depends
+from decouple import config
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi_filter import FilterDepends
 from sqlalchemy.orm import Session
 
 from api.utils.db_services import get_db
 from api.utils.security import get_current_user
 from api.v1._shared.models import User
-from api.v1._shared.schemas import ProductResponse
+from api.v1._shared.schemas import ProductFilter, ProductResponse
+from api.v1.fakestoreapi.services.redis import CacheEntry
 from api.v1.fakestoreapi.use_case import ProductUseCase
 
+# Use "public" para permitir que CDNs/proxies compartilhados também guardem a resposta
+CATALOG_CACHE_CONTROL = config("CATALOG_CACHE_CONTROL", default="private, max-age=60")
+
 router = APIRouter(
     prefix="/fakestoreapi",
     tags=["FakeStoreAPI"], 
@@ -17,17 +24,110 @@ router = APIRouter(
 
 @router.get("", response_model=List[ProductResponse])
 async def list(
+    request: Request,
+    skip: int = Query(0, ge=0, description="Número de registros para pular"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Número máximo de registros a retornar"),
+    product_filter: ProductFilter = FilterDepends(ProductFilter),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> List[ProductResponse]:
+    """
+    Listar produtos do catálogo
+
+    - skip / limit: paginação (sem limit, retorna todos)
+    - Filtros disponíveis via query params:
+        - title__ilike, description__ilike, category__ilike: Busca parcial (case-insensitive)
+        - search: Busca textual nos campos title, description e category
+        - order_by: Ordenação por id_api, title, price, category, rate ou count (ex: order_by=-price,title)
+    - Com filtros ou paginação, o header X-Total-Count traz o total filtrado
+    """
     use_case = ProductUseCase(db)
+
+    # Consultas com filtro/paginação são resolvidas na foto em memória do catálogo
+    if skip or limit or product_filter.model_dump(exclude_none=True):
+        total, body = await use_case.query(product_filter, skip, limit)
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={"X-Total-Count": str(total)},
+        )
+
+    cached = await use_case.list_cached()
+    if cached:
+        return _cached_response(cached, request)
     return await use_case.list()
 
+@router.get("/search", response_model=List[ProductResponse])
+async def search(
+    q: str = Query(..., min_length=2, max_length=200, description="Termo de busca"),
+    limit: int = Query(10, ge=1, le=100, description="Número máximo de registros a retornar"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> List[ProductResponse]:
+    """
+    Busca produtos no catálogo local, ordenados por relevância
+
+    - q: Termo de busca (aceita a sintaxe de busca web: "frase exata", -excluir, or)
+    - limit: Número máximo de registros a retornar (padrão: 10, máximo: 100)
+    """
+    use_case = ProductUseCase(db)
+    return await use_case.search(q, limit)
+
 @router.get("/{id}", response_model=ProductResponse)
 async def get(
     id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> ProductResponse:
     use_case = ProductUseCase(db)
-    return await use_case.get(id)
\ No newline at end of file
+    cached = await use_case.get_cached(id)
+    if cached:
+        return _cached_response(cached, request)
+    return await use_case.get(id)
+
+
+def _cached_response(entry: CacheEntry, request: Request) -> Response:
+    headers = _cache_headers(entry)
+
+    if _not_modified(entry, request):
+        return Response(status_code=304, headers=headers)
+
+    # O corpo já está serializado no formato do response_model, então é enviado sem revalidação
+    return Response(
+        content=entry.body,
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def _cache_headers(entry: CacheEntry) -> Dict[str, str]:
+    headers = {"Cache-Control": CATALOG_CACHE_CONTROL}
+    if entry.etag:
+        headers["ETag"] = entry.etag
+    if entry.last_modified:
+        headers["Last-Modified"] = formatdate(entry.last_modified, usegmt=True)
+    return headers
+
+
+def _not_modified(entry: CacheEntry, request: Request) -> bool:
+    """Avalia If-None-Match e, na ausência dele, If-Modified-Since (RFC 9110)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if not entry.etag:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        # If-None-Match usa comparação fraca: ignora o prefixo W/
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return entry.etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and entry.last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(entry.last_modified) <= since
+
+    return False
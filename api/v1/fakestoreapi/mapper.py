@@ -1,6 +1,11 @@
-from api.v1._shared.schemas import ProductResponse
+import hashlib
+import json
+
+from api.v1._shared.schemas import ProductBase, ProductResponse
 from typing import List, Dict, Any
 
+PRODUCT_CONTENT_FIELDS = set(ProductBase.model_fields) - {"id"}
+
 
 
 def mapper_response_to_list_products(response: List[Dict[str, Any]]) -> List[ProductResponse]:
@@ -30,9 +35,26 @@ def mapper_list_products_to_list_dict(products: List[ProductResponse]) -> List[D
     return result
 
 
+def mapper_product_to_json(product: ProductResponse) -> str:
+    # Mesmo JSON que o FastAPI geraria a partir do response_model
+    return product.model_dump_json()
+
+
+def mapper_list_json_to_json_array(products_json: List[str]) -> str:
+    return f"[{','.join(products_json)}]"
+
+
 def mapper_dict_to_product(product_dict: Dict[str, Any]) -> ProductResponse:
     return ProductResponse(**product_dict)
     
 
 def mapper_product_to_dict(product: ProductResponse) -> Dict[str, Any]:
-    return product.model_dump()
\ No newline at end of file
+    return product.model_dump()
+
+
+def mapper_product_to_content_hash(product: ProductBase) -> str:
+    # Apenas os campos vindos da API externa entram no hash
+    content = product.model_dump(include=PRODUCT_CONTENT_FIELDS)
+    return hashlib.sha256(
+        json.dumps(content, sort_keys=True, separators=(",", ":")).encode()
+    ).hexdigest()
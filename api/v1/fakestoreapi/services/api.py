@@ -1,8 +1,11 @@
-from typing import List
+import time
+from typing import List, Optional
 
-import requests
+import httpx
 
 from api.utils.exceptions import exception_500_INTERNAL_SERVER_ERROR
+from api.utils.http_client import get_http_client
+from api.utils.metrics import UPSTREAM_DURATION, UPSTREAM_ERRORS
 from api.v1._shared.schemas import ProductResponse
 from api.v1.fakestoreapi.mapper import (
     mapper_response_to_list_products,
@@ -14,9 +17,36 @@ URL = 'https://fakestoreapi.com/products'
 
 class APIService:
 
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        # Por padrão usa o cliente compartilhado da aplicação (pool keep-alive)
+        self.client = client or get_http_client()
+
+    async def _get(self, endpoint: str, url: str) -> httpx.Response:
+        # endpoint é o nome lógico da chamada (list/get), não a URL, para não criar uma série por id
+        start = time.perf_counter()
+        try:
+            response = await self.client.get(url)
+            response.raise_for_status()
+            return response
+
+        except httpx.HTTPStatusError as e:
+            UPSTREAM_ERRORS.labels(endpoint, str(e.response.status_code)).inc()
+            raise
+
+        except httpx.TimeoutException:
+            UPSTREAM_ERRORS.labels(endpoint, "timeout").inc()
+            raise
+
+        except Exception:
+            UPSTREAM_ERRORS.labels(endpoint, "error").inc()
+            raise
+
+        finally:
+            UPSTREAM_DURATION.labels(endpoint).observe(time.perf_counter() - start)
+
     async def list(self) -> List[ProductResponse]:
         try:
-            response = requests.get(URL)
+            response = await self._get("list", URL)
             return mapper_response_to_list_products(response.json())
 
         except Exception as e:
@@ -26,10 +56,10 @@ class APIService:
 
     async def get(self, id: int) -> ProductResponse:
         try:
-            response = requests.get(f"{URL}/{id}")
+            response = await self._get("get", f"{URL}/{id}")
             product_data = response.json()
             return mapper_response_to_product(product_data)
         except Exception as e:
             raise exception_500_INTERNAL_SERVER_ERROR(
                 detail=f"Erro ao buscar produto: {str(e)}"
-            )
\ No newline at end of file
+            )
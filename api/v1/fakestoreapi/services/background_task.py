@@ -1,18 +1,56 @@
-import asyncio
 import logging
+import random
 from typing import Any, Dict, List
 
-from api.utils.celery import celery_app
+from decouple import config
+from redis.exceptions import LockError
+
+from api.utils.celery import CATALOG_SYNC_INTERVAL, SCHEDULED_SYNC_ENABLED, celery_app, run_async
 from api.utils.db_services import SyncSessionLocal 
 from api.utils.exceptions import exception_500_INTERNAL_SERVER_ERROR
+from api.utils.redis_pool import get_redis_sync
 from api.v1._shared.schemas import ProductCreate
-from api.v1.fakestoreapi.mapper import mapper_list_products_to_list_dict
+from api.v1.fakestoreapi.mapper import (
+    mapper_list_products_to_list_dict,
+    mapper_product_to_dict,
+)
 from api.v1.fakestoreapi.services.api import APIService
-from api.v1.fakestoreapi.services.redis import RedisService
+from api.v1.fakestoreapi.services.redis import TTL_SECONDS, RedisService
 from api.v1.fakestoreapi.services.produto_sync import ProductServiceSync
 
 DELAY_TIME = 60
 MAX_RETRIES = 3
+# Atraso aleatório para que workers/réplicas não sincronizem todos no mesmo instante
+CATALOG_SYNC_JITTER = config("CATALOG_SYNC_JITTER", default=30, cast=int)
+# Deve ser maior que a duração de uma sincronização completa
+CATALOG_SYNC_LOCK_TTL = config("CATALOG_SYNC_LOCK_TTL", default=300, cast=int)
+CATALOG_SYNC_LOCK_KEY = "lock:catalog_sync"
+
+if SCHEDULED_SYNC_ENABLED and CATALOG_SYNC_INTERVAL + CATALOG_SYNC_JITTER >= TTL_SECONDS:
+    # Sem sincronização pelas requisições, o catálogo ficaria sem cache entre uma execução e outra
+    logging.warning(
+        f"CATALOG_SYNC_INTERVAL ({CATALOG_SYNC_INTERVAL}s) + CATALOG_SYNC_JITTER ({CATALOG_SYNC_JITTER}s) "
+        f"não é menor que REDIS_TTL ({TTL_SECONDS}s): o catálogo expira antes da próxima sincronização"
+    )
+
+async def _fetch_products_api():
+    # O loop do processo é persistente (run_async), então o cliente HTTP compartilhado é reutilizado entre as tasks
+    return await APIService().list()
+
+
+async def _fetch_product_api(id: int):
+    return await APIService().get(id)
+
+
+async def _delete_products_redis(ids_api: List[int]):
+    await RedisService().delete_all(ids_api)
+
+
+@celery_app.task(name="schedule_catalog_sync")
+def schedule_catalog_sync():
+    # Disparada pelo Celery beat; o jitter espalha as sincronizações no tempo
+    countdown = random.uniform(0, CATALOG_SYNC_JITTER)
+    get_products_api.apply_async(countdown=countdown)
 
 
 @celery_app.task(
@@ -22,30 +60,54 @@ MAX_RETRIES = 3
     default_retry_delay=DELAY_TIME  
 )
 def get_products_api(self):
-    # O Celery não suporta async/await diretamente, então criei um loop
     logging.info(f"Celery starting get_products_api")
-    loop = None
+
+    # Lock distribuído: apenas uma sincronização do catálogo roda no cluster
+    lock = get_redis_sync().lock(CATALOG_SYNC_LOCK_KEY, timeout=CATALOG_SYNC_LOCK_TTL)
+    if not lock.acquire(blocking=False):
+        logging.info("Sincronização do catálogo já em andamento, ignorando")
+        return
+
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        serviceAPI = APIService()
         serviceRedis = RedisService()
-        products = loop.run_until_complete(serviceAPI.list())
+        products = run_async(_fetch_products_api())
         
         if products:
             # O Celery não aceita objetos, então converti para dicionário
             products_dict = mapper_list_products_to_list_dict(products)
             save_or_update_products_in_database_sql_task.delay(products_dict)
-            loop.run_until_complete(serviceRedis.create_or_update_all(products))
+            run_async(serviceRedis.create_or_update_all(products))
         
     except Exception as e:
         logging.error(f"Erro ao buscar produtos da API: {e}")
         self.retry(exc=e)
 
     finally:
-        if loop:
-            loop.close()
+        try:
+            lock.release()
+        except LockError:
+            pass
+
+
+@celery_app.task(
+    name="get_product_api",
+    bind=True,
+    max_retries=MAX_RETRIES,
+    default_retry_delay=DELAY_TIME  
+)
+def get_product_api(self, id: int):
+    logging.info(f"Celery starting get_product_api")
+    try:
+        serviceRedis = RedisService()
+        product = run_async(_fetch_product_api(id))
+
+        if product:
+            save_or_update_product_task.delay(mapper_product_to_dict(product))
+            run_async(serviceRedis.create_or_update(id, product))
+
+    except Exception as e:
+        logging.error(f"Erro ao buscar produto {id} da API: {e}")
+        self.retry(exc=e)
 
 
 
@@ -55,14 +117,19 @@ def get_products_api(self):
     max_retries=MAX_RETRIES,
     default_retry_delay=DELAY_TIME  
 )
-def save_or_update_products_in_database_sql_task(self, products: List[Dict[str, Any]]):
+def save_or_update_products_in_database_sql_task(self, products: List[Dict[str, Any]]) -> Dict[str, int]:
     logging.info(f"Celery starting save_or_update_products_in_database_sql_task")
     db = SyncSessionLocal()
     serviceSQL = ProductServiceSync(db)
     try:
-        for product in products:
-            serviceSQL.save_or_update(ProductCreate(**product))
-        
+        # Apenas produtos novos, alterados ou removidos são gravados
+        result = serviceSQL.sync_catalog([ProductCreate(**product) for product in products])
+        if result.tombstoned:
+            run_async(_delete_products_redis(result.tombstoned))
+
+        logging.info(f"Sincronização de produtos concluída: {result.counts()}")
+        return result.counts()
+
     except Exception as e:
         self.retry(exc=e)
 
@@ -80,7 +147,7 @@ def save_or_update_product_task(product: Dict[str, Any]):
     db = SyncSessionLocal()
     serviceSQL = ProductServiceSync(db)
     try:
-        serviceSQL.save_or_update(ProductCreate(**product))
+        serviceSQL.sync_catalog([ProductCreate(**product)], tombstone_missing=False)
 
     except Exception as e:
         logging.error(f"Erro ao salvar produto: {e}")
@@ -0,0 +1,305 @@
+import asyncio
+import json
+import logging
+import re
+import time
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Set, Tuple
+
+from decouple import config
+
+from api.utils.exceptions import exception_400_BAD_REQUEST
+from api.utils.redis_pool import get_redis
+from api.utils.single_flight import SingleFlight
+from api.v1._shared.schemas import ProductFilter, ProductResponse
+from api.v1.fakestoreapi.services.redis import (
+    CATALOG_CHANNEL,
+    SOFT_TTL_SECONDS,
+    TTL_SECONDS,
+    RedisService,
+)
+
+
+CATALOG_INDEX_ENABLED = config("CATALOG_INDEX_ENABLED", default=True, cast=bool)
+# Espera entre tentativas de reconectar ao canal de atualizações
+CATALOG_INDEX_RETRY_INTERVAL = config("CATALOG_INDEX_RETRY_INTERVAL", default=5.0, cast=float)
+# Espera máxima por mensagem em cada leitura; deve ser menor que REDIS_SOCKET_TIMEOUT do pool
+CATALOG_INDEX_POLL_INTERVAL = config("CATALOG_INDEX_POLL_INTERVAL", default=1.0, cast=float)
+
+TOKEN_RE = re.compile(r"\w+")
+NUMERIC_FIELDS = ("id_api", "price", "rate", "count")
+# Campos de texto ordenáveis; description e image só existem no JSON da linha
+TEXT_FIELDS = ("title", "category")
+# Campos com índice invertido por token; os demais filtros de texto percorrem os candidatos
+INDEXED_FIELDS = ("title", "category")
+
+
+def _like_pattern(value: str) -> str:
+    # Mesmo comportamento do fastapi-filter: sem %, o valor é buscado como substring
+    return value if "%" in value else f"%{value}%"
+
+
+def _like_to_regex(pattern: str) -> Pattern:
+    regex = "".join(
+        ".*" if char == "%" else "." if char == "_" else re.escape(char)
+        for char in pattern
+    )
+    return re.compile(regex, re.IGNORECASE | re.DOTALL)
+
+
+class CatalogSnapshot:
+    """
+    Foto imutável do catálogo para filtrar, ordenar e paginar em memória.
+
+    - colunas numéricas em arrays compactos (price, rate, count, id_api)
+    - índice invertido de tokens para title e category
+    - cada produto já serializado em JSON, no formato do response_model
+    """
+
+    def __init__(self, products: List[Dict[str, Any]], version: int = 0, etag: Optional[str] = None):
+        self.version = version
+        self.etag = etag
+        self.size = len(products)
+        self.rows: Tuple[str, ...] = tuple(
+            json.dumps(product, ensure_ascii=False, separators=(",", ":"))
+            for product in products
+        )
+        self.columns: Dict[str, array] = {
+            field: array("d" if field in ("price", "rate") else "q", (product[field] for product in products))
+            for field in NUMERIC_FIELDS
+        }
+        self.text: Dict[str, Tuple[str, ...]] = {
+            field: tuple(product[field] for product in products) for field in TEXT_FIELDS
+        }
+        self.lower: Dict[str, Tuple[str, ...]] = {
+            field: tuple(product[field].lower() for product in products)
+            for field in ProductFilter.Constants.search_model_fields
+        }
+        self.inverted: Dict[str, Dict[str, array]] = {
+            field: self._build_inverted(self.lower[field]) for field in INDEXED_FIELDS
+        }
+        # Ordenações completas calculadas sob demanda (derivadas, não alteram a foto)
+        self._orders: Dict[Tuple[str, bool], array] = {}
+
+    @classmethod
+    def from_json(cls, body: str, version: int = 0, etag: Optional[str] = None) -> "CatalogSnapshot":
+        return cls(json.loads(body), version, etag)
+
+    @classmethod
+    def from_products(cls, products: List[ProductResponse]) -> "CatalogSnapshot":
+        return cls([product.model_dump(mode="json") for product in products])
+
+    @staticmethod
+    def _build_inverted(values: Iterable[str]) -> Dict[str, array]:
+        postings: Dict[str, List[int]] = {}
+        for position, value in enumerate(values):
+            for token in set(TOKEN_RE.findall(value)):
+                postings.setdefault(token, []).append(position)
+        return {token: array("l", positions) for token, positions in postings.items()}
+
+    def _column(self, field: str):
+        if field in self.columns:
+            return self.columns[field]
+        if field in self.text:
+            return self.text[field]
+        raise exception_400_BAD_REQUEST(detail=f"Ordenação por {field} não suportada")
+
+    def _order(self, field: str, descending: bool) -> array:
+        key = (field, descending)
+        if key not in self._orders:
+            column = self._column(field)
+            self._orders[key] = array(
+                "l", sorted(range(self.size), key=column.__getitem__, reverse=descending)
+            )
+        return self._orders[key]
+
+    def _prune(self, field: str, pattern: str) -> Optional[Set[int]]:
+        """
+        Candidatos pelo índice invertido: cada trecho literal do padrão está contido
+        em um único token do valor, então basta unir os tokens que contêm o maior trecho.
+        """
+        if field not in self.inverted:
+            return None
+        words = TOKEN_RE.findall(re.sub(r"[%_]", " ", pattern).lower())
+        if not words:
+            return None
+        piece = max(words, key=len)
+        candidates: Set[int] = set()
+        for token, positions in self.inverted[field].items():
+            if piece in token:
+                candidates.update(positions)
+        return candidates
+
+    def _match(self, field: str, pattern: str, candidates: Optional[Iterable[int]]) -> List[int]:
+        values = self.lower[field]
+        pruned = self._prune(field, pattern)
+        if pruned is not None:
+            candidates = sorted(pruned if candidates is None else pruned.intersection(candidates))
+        elif candidates is None:
+            candidates = range(self.size)
+
+        inner = pattern[1:-1]
+        if pattern.startswith("%") and pattern.endswith("%") and not re.search(r"[%_]", inner):
+            literal = inner.lower()
+            return [position for position in candidates if literal in values[position]]
+
+        regex = _like_to_regex(pattern)
+        return [position for position in candidates if regex.fullmatch(values[position])]
+
+    def query(
+        self,
+        product_filter: Optional[ProductFilter] = None,
+        skip: int = 0,
+        limit: Optional[int] = None,
+    ) -> Tuple[int, str]:
+        """Retorna o total filtrado e o JSON da página pedida."""
+        candidates: Optional[List[int]] = None
+        order_by: List[str] = []
+
+        if product_filter is not None:
+            for field in ProductFilter.Constants.search_model_fields:
+                value = getattr(product_filter, f"{field}__ilike")
+                if value:
+                    candidates = self._match(field, _like_pattern(value), candidates)
+
+            if product_filter.search:
+                pattern = f"%{product_filter.search}%"
+                matches: Set[int] = set()
+                for field in ProductFilter.Constants.search_model_fields:
+                    matches.update(self._match(field, pattern, candidates))
+                candidates = sorted(matches)
+
+            order_by = product_filter.ordering_values or []
+
+        if order_by and candidates is None and len(order_by) == 1:
+            field = order_by[0].lstrip("+-")
+            ordered = self._order(field, order_by[0].startswith("-"))
+        else:
+            # Sem filtro nem ordenação, o range evita materializar todas as posições
+            ordered = range(self.size) if candidates is None else candidates
+            if order_by:
+                ordered = list(ordered)
+            # Ordenações estáveis da última chave para a primeira equivalem à ordenação composta
+            for value in reversed(order_by):
+                ordered.sort(key=self._column(value.lstrip("+-")).__getitem__, reverse=value.startswith("-"))
+
+        total = len(ordered)
+        end = None if limit is None else skip + limit
+        rows = self.rows
+        return total, f"[{','.join(rows[position] for position in ordered[skip:end])}]"
+
+
+class CatalogIndex:
+    """
+    Mantém a foto do catálogo do worker atualizada.
+
+    A sincronização grava o catálogo no Redis e publica a nova versão em
+    CATALOG_CHANNEL; cada worker reconstrói a sua foto em uma thread e troca a
+    referência de uma vez, então as consultas nunca enxergam um índice parcial.
+
+    Guarda também os prazos do snapshot no Redis: após o soft TTL a foto ainda é
+    servida enquanto o catálogo é revalidado; após o TTL a chave já expirou e a
+    foto é recarregada (ou descartada, se o catálogo não estiver mais no Redis).
+    """
+
+    def __init__(self):
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._soft_expires_at = 0.0
+        self._expires_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._single_flight = SingleFlight(mode="local", name="catalog_index")
+
+    @property
+    def snapshot(self) -> Optional[CatalogSnapshot]:
+        return self._snapshot
+
+    @property
+    def is_stale(self) -> bool:
+        return time.time() >= self._soft_expires_at
+
+    @property
+    def is_expired(self) -> bool:
+        return time.time() >= self._expires_at
+
+    async def get(self) -> Optional[CatalogSnapshot]:
+        if self._snapshot is None or self.is_expired:
+            await self.refresh()
+        return self._snapshot
+
+    async def refresh(self, version: Optional[int] = None) -> Optional[CatalogSnapshot]:
+        if version is not None and self._snapshot and self._snapshot.version >= version:
+            return self._snapshot
+        return await self._single_flight.do("catalog_index", self._load)
+
+    async def _load(self) -> Optional[CatalogSnapshot]:
+        try:
+            catalog = await RedisService().get_catalog(raise_errors=True)
+        except Exception as e:
+            # Redis indisponível não significa catálogo expirado: mantém a foto e tenta de novo depois
+            logging.info(f"Erro ao carregar o catálogo do Redis: {e}")
+            self._expires_at = time.time() + CATALOG_INDEX_RETRY_INTERVAL
+            return self._snapshot
+
+        if not catalog:
+            # Chave expirada ou removida: uma foto sem prazo seria servida indefinidamente
+            if self._snapshot is not None:
+                logging.info("Catálogo ausente no Redis, descartando o índice em memória")
+            self._snapshot = None
+            self._soft_expires_at = self._expires_at = 0.0
+            return None
+
+        # O snapshot é regravado a cada sincronização, mesmo sem mudança de conteúdo
+        soft_expires_at = catalog.header.get("soft_expires_at", 0.0)
+        self._soft_expires_at = soft_expires_at
+        self._expires_at = soft_expires_at - SOFT_TTL_SECONDS + TTL_SECONDS
+
+        current = self._snapshot
+        if current and current.etag == catalog.etag:
+            return current
+
+        version = catalog.header.get("version", 0)
+        self._snapshot = await asyncio.to_thread(
+            CatalogSnapshot.from_json, catalog.body, version, catalog.etag
+        )
+        logging.info(f"Índice do catálogo carregado: versão {version}, {self._snapshot.size} produtos")
+        return self._snapshot
+
+    def start(self) -> None:
+        if CATALOG_INDEX_ENABLED and self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                # A inscrição ocupa uma conexão do pool compartilhado enquanto estiver ativa
+                async with get_redis().pubsub() as pubsub:
+                    await pubsub.subscribe(CATALOG_CHANNEL)
+                    # Mensagens publicadas enquanto estava desconectado são perdidas
+                    await self.refresh()
+                    # listen() bloquearia até o socket_timeout do pool e derrubaria a inscrição
+                    # a cada período ocioso; aqui um timeout sem mensagem é apenas mais uma volta
+                    while True:
+                        message = await pubsub.get_message(
+                            ignore_subscribe_messages=True, timeout=CATALOG_INDEX_POLL_INTERVAL
+                        )
+                        if message is not None and message["type"] == "message":
+                            await self.refresh(int(message["data"]))
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                logging.info(f"Erro no canal de atualizações do catálogo: {e}")
+                await asyncio.sleep(CATALOG_INDEX_RETRY_INTERVAL)
+
+
+catalog_index = CatalogIndex()
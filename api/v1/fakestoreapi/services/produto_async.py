@@ -1,7 +1,7 @@
 from typing import List
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import func, literal, or_, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -25,6 +25,33 @@ class ProductService:
         products = result.scalars().all()
         return [ProductResponse.model_validate(product) for product in products]
 
+    async def search(self, term: str, limit: int = 10) -> List[ProductResponse]:
+        """
+        Busca ranqueada no catálogo local.
+
+        Combina a busca textual (tsvector com pesos título > categoria > descrição)
+        com similaridade por trigramas no título, que tolera erros de digitação.
+        Os dois predicados usam índices GIN.
+        """
+        query_ts = func.websearch_to_tsquery('english', term)
+        rank = func.ts_rank_cd(Product.search_vector, query_ts) + func.word_similarity(term, Product.title)
+
+        query = (
+            select(Product)
+            .where(
+                Product.flg_deleted == False,
+                or_(
+                    Product.search_vector.op('@@')(query_ts),
+                    literal(term).op('<%')(Product.title),
+                ),
+            )
+            .order_by(rank.desc(), Product.id_api)
+            .limit(limit)
+        )
+        result = await self.db.execute(query)
+        products = result.scalars().all()
+        return [ProductResponse.model_validate(product) for product in products]
+
 
     async def get(self, id: UUID) -> ProductResponse:
         query = select(Product).where(
@@ -1,17 +1,36 @@
-from typing import List
-from uuid import UUID
+from datetime import datetime
+from typing import Dict, List, NamedTuple
 
-from sqlalchemy import select
+from decouple import config
+from sqlalchemy import or_, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session  # Session síncrona
 
-from api.utils.exceptions import exception_400_BAD_REQUEST, exception_404_NOT_FOUND
-from api.v1._shared.models import Product
-from api.v1._shared.schemas import (
-    ProductCreate,
-    ProductResponse,
-    ProductUpdate,
-)
+from api.utils.exceptions import exception_400_BAD_REQUEST
+from api.v1._shared.models import Product, tz
+from api.v1._shared.schemas import ProductCreate
+from api.v1.fakestoreapi.mapper import mapper_product_to_content_hash
+
+# Linhas enviadas por executemany; todos os lotes rodam na mesma transação
+UPSERT_BATCH_SIZE = config("PRODUCT_UPSERT_BATCH_SIZE", default=1000, cast=int)
+UPSERT_FIELDS = ["title", "price", "description", "category", "image", "rate", "count"]
+
+
+class SyncResult(NamedTuple):
+    inserted: int
+    updated: int
+    unchanged: int
+    tombstoned: List[int]
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "tombstoned": len(self.tombstoned),
+        }
+
 
 class ProductServiceSync:
     """
@@ -21,55 +40,86 @@ class ProductServiceSync:
     def __init__(self, db: Session):
         self.db = db
 
-    def get_by_id_api(self, id_api: int):
-        query = select(Product).where(
-            Product.id_api == id_api,
-            Product.flg_deleted == False
-        )
-        result = self.db.execute(query)
-        return result.scalar_one_or_none()
-
-
-    def save_or_update(self, product: ProductCreate) -> ProductResponse:
-        product_exists = self.get_by_id_api(product.id_api)
+    def sync_catalog(self, products: List[ProductCreate], tombstone_missing: bool = True) -> SyncResult:
+        """
+        Compara o hash de conteúdo do lote com o banco e grava apenas o que mudou:
+        - inseridos: id_api ainda não existe
+        - atualizados: hash diferente ou produto marcado como deletado
+        - tombstoned: produtos ativos que não vieram no catálogo (flg_deleted = True)
+        """
+        incoming = {product.id_api: product for product in products}
+        hashes = {id_api: mapper_product_to_content_hash(product) for id_api, product in incoming.items()}
 
-        if product_exists:
-            return self.update(product)
-        else:
-            return self.create(product)
+        query = select(Product.id_api, Product.content_hash, Product.flg_deleted)
+        if not tombstone_missing:
+            query = query.where(Product.id_api.in_(incoming))
+        existing = {row.id_api: row for row in self.db.execute(query)}
 
+        inserted = [id_api for id_api in incoming if id_api not in existing]
+        updated = [
+            id_api for id_api in incoming
+            if id_api in existing
+            and (existing[id_api].flg_deleted or existing[id_api].content_hash != hashes[id_api])
+        ]
+        # Catálogo vazio indica falha na API externa, nunca remoção de todos os produtos
+        tombstoned = []
+        if tombstone_missing and incoming:
+            tombstoned = [
+                id_api for id_api, row in existing.items()
+                if not row.flg_deleted and id_api not in incoming
+            ]
 
-    def create(self, product: ProductCreate) -> ProductResponse:
-        new_product = Product(
-            **product.model_dump(exclude_none=True)
-        )
-        
-        try:
-            self.db.add(new_product)
-            self.db.commit()
-            self.db.refresh(new_product)
-        except IntegrityError as e:
-            self.db.rollback()
-            raise exception_400_BAD_REQUEST(detail=f"Erro ao criar produto: {str(e)}")
-        
-        return ProductResponse.model_validate(new_product)
-
-    def update(self, product: ProductCreate) -> ProductResponse:
-        product_exists = self.get_by_id_api(product.id_api)
-        
-        if not product_exists:
-            raise exception_404_NOT_FOUND(detail=f"Produto com ID API {product.id_api} não encontrado")
-
-        update_data = product.model_dump(exclude_none=True, exclude={"id_api"})
-        
-        for field, value in update_data.items():
-            setattr(product_exists, field, value)
-        
         try:
+            self._upsert([incoming[id_api] for id_api in inserted + updated], hashes)
+            if tombstoned:
+                self.db.execute(
+                    update(Product)
+                    .where(Product.id_api.in_(tombstoned))
+                    .values(flg_deleted=True, updated_at=datetime.now(tz))
+                )
             self.db.commit()
-            self.db.refresh(product_exists)
         except IntegrityError as e:
             self.db.rollback()
-            raise exception_400_BAD_REQUEST(detail=f"Erro ao atualizar produto: {str(e)}")
-        
-        return ProductResponse.model_validate(product_exists)
\ No newline at end of file
+            raise exception_400_BAD_REQUEST(detail=f"Erro ao sincronizar produtos: {str(e)}")
+
+        return SyncResult(
+            inserted=len(inserted),
+            updated=len(updated),
+            unchanged=len(incoming) - len(inserted) - len(updated),
+            tombstoned=tombstoned,
+        )
+
+
+    def _upsert(self, products: List[ProductCreate], hashes: Dict[int, str]) -> int:
+        now = datetime.now(tz)
+        # Um mesmo id_api não pode aparecer duas vezes no mesmo INSERT ... ON CONFLICT
+        rows = {}
+        for product in products:
+            rows[product.id_api] = {
+                **product.model_dump(exclude={"id"}),
+                "content_hash": hashes[product.id_api],
+                "updated_at": now,
+            }
+        rows = list(rows.values())
+        if not rows:
+            return 0
+
+        stmt = insert(Product)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Product.id_api],
+            set_={
+                **{field: stmt.excluded[field] for field in UPSERT_FIELDS},
+                "content_hash": stmt.excluded.content_hash,
+                "updated_at": stmt.excluded.updated_at,
+                "flg_deleted": False,
+            },
+            # Não reescreve (nem gera WAL para) linhas cujo conteúdo não mudou
+            where=or_(
+                Product.content_hash.is_distinct_from(stmt.excluded.content_hash),
+                Product.flg_deleted == True,
+            ),
+        )
+
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            self.db.execute(stmt, rows[start:start + UPSERT_BATCH_SIZE])
+        return len(rows)
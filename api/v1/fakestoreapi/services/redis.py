@@ -1,85 +1,271 @@
+import hashlib
 import json
-from typing import List, Optional
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 from decouple import config
 from redis.asyncio import Redis
+from redis.exceptions import WatchError
+from api.utils.metrics import CACHE_RESULTS
+from api.utils.redis_pool import get_redis
 from api.v1._shared.schemas import ProductResponse
-from api.v1.fakestoreapi.mapper import mapper_product_to_dict, mapper_dict_to_product
+from api.v1.fakestoreapi.mapper import (
+    mapper_dict_to_product,
+    mapper_list_json_to_json_array,
+    mapper_product_to_json,
+)
 import logging
 
-REDIS_URL = config("REDIS_URL")
 TTL_SECONDS = int(config("REDIS_TTL"))
+# Após o soft TTL o valor ainda é servido, mas uma única atualização é disparada em background
+SOFT_TTL_SECONDS = config("REDIS_SOFT_TTL", default=TTL_SECONDS // 2, cast=int)
+REFRESH_LOCK_TTL_SECONDS = config("REDIS_REFRESH_LOCK_TTL", default=60, cast=int)
+# Quantidade de comandos enviados por round trip nas gravações em lote
+BATCH_SIZE = config("REDIS_BATCH_SIZE", default=500, cast=int)
+# Canal em que a versão do catálogo é publicada a cada gravação do snapshot
+CATALOG_CHANNEL = "product:catalog:updates"
+
+
+class CacheEntry(NamedTuple):
+    """Valor do cache: metadados (soft TTL, ETag, versão) e o JSON pronto para resposta."""
+    header: Dict[str, Any]
+    body: str
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.header.get("etag")
+
+    @property
+    def last_modified(self) -> Optional[float]:
+        return self.header.get("last_modified")
+
+    @property
+    def is_stale(self) -> bool:
+        return time.time() >= self.header.get("soft_expires_at", 0)
 
 
 class RedisService:
-    
-    def __init__(self):
-        self.r = Redis.from_url(REDIS_URL, decode_responses=True)
+
+    def __init__(self, client: Optional[Redis] = None):
+        # Por padrão usa o pool compartilhado do processo; o serviço não abre nem fecha conexões
+        self.r = client or get_redis()
         self.model = ProductResponse
         self.keyspace = "product"
-    
+
     def _get_key(self, id_api: int) -> str:
         return f"{self.keyspace}:{id_api}"
-    
+
+    def _get_catalog_key(self) -> str:
+        return f"{self.keyspace}:catalog"
+
+    def _get_catalog_version_key(self) -> str:
+        # Sem TTL: a versão sobrevive à expiração do snapshot
+        return f"{self.keyspace}:catalog:version"
+
+    def _get_refresh_key(self, name: Any) -> str:
+        return f"refresh:{self.keyspace}:{name}"
+
+    @staticmethod
+    def _content_hash(body: str) -> str:
+        return hashlib.blake2b(body.encode(), digest_size=16).hexdigest()
+
+    @classmethod
+    def _pack(cls, body: str, **metadata: Any) -> str:
+        # Cabeçalho com os metadados na primeira linha e o JSON na segunda
+        header = {"soft_expires_at": time.time() + SOFT_TTL_SECONDS, **metadata}
+        if "etag" not in header:
+            header["etag"] = f'"{cls._content_hash(body)}"'
+        return f"{json.dumps(header)}\n{body}"
+
+    @staticmethod
+    def _unpack(value: str) -> Optional[CacheEntry]:
+        header, sep, body = value.partition("\n")
+        if not sep:
+            return None
+        return CacheEntry(json.loads(header), body)
+
     async def create_or_update(self, id_api: int, product: ProductResponse) -> bool:
         try:
             logging.info(f"Salvando produto {id_api} no Redis")
-            product_dict = mapper_product_to_dict(product)
-            product_json = json.dumps(product_dict)
+            product_json = mapper_product_to_json(product)
             key = self._get_key(id_api)
-            resp = await self.r.set(key, product_json)
-            await self.r.expire(key, TTL_SECONDS)
+            resp = await self.r.set(key, self._pack(product_json), ex=TTL_SECONDS)
             return bool(resp)
 
         except Exception as e:
             logging.info(f"Erro ao salvar produto {id_api} no Redis: {e}")
             return False
-    
+
     async def create_or_update_all(self, products: List[ProductResponse]) -> bool:
         try:
-            for product in products:
-                await self.create_or_update(product.id_api, product)
-                
+            products_json = [mapper_product_to_json(product) for product in products]
+
+            # SET ... EX em um único comando, enviados em lotes via MULTI/EXEC:
+            # um round trip por lote e nenhuma chave fica sem TTL
+            for start in range(0, len(products), BATCH_SIZE):
+                async with self.r.pipeline(transaction=True) as pipe:
+                    for product, product_json in zip(
+                        products[start:start + BATCH_SIZE],
+                        products_json[start:start + BATCH_SIZE],
+                    ):
+                        pipe.set(
+                            self._get_key(product.id_api),
+                            self._pack(product_json),
+                            ex=TTL_SECONDS,
+                        )
+                    await pipe.execute()
+
+            # O catálogo inteiro é gravado como um único snapshot já serializado,
+            # então a listagem nunca enxerga um catálogo parcial
+            catalog_json = mapper_list_json_to_json_array(products_json)
+            version = await self._save_catalog(catalog_json)
+            await self.r.publish(CATALOG_CHANNEL, version)
             return True
 
         except Exception as e:
             logging.info(f"Erro ao salvar produtos no Redis: {e}")
             return False
-    
+
+    async def delete_all(self, ids_api: List[int]) -> bool:
+        """Remove do cache os produtos que deixaram de existir no catálogo."""
+        try:
+            if ids_api:
+                await self.r.delete(*[self._get_key(id_api) for id_api in ids_api])
+            return True
+
+        except Exception as e:
+            logging.info(f"Erro ao remover produtos do Redis: {e}")
+            return False
+
+    async def _save_catalog(self, catalog_json: str) -> int:
+        """
+        Grava o snapshot do catálogo, incrementando a versão apenas quando o conteúdo mudou.
+
+        Leitura da versão e gravação ocorrem sob WATCH/MULTI: se outro processo gravar o
+        catálogo no meio, a transação é descartada e refeita com a versão nova, então
+        duas gravações concorrentes nunca publicam o mesmo número para conteúdos diferentes.
+        """
+        key = self._get_catalog_version_key()
+        content_hash = self._content_hash(catalog_json)
+
+        async with self.r.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(key)
+                    current = await pipe.hgetall(key)
+
+                    changed = current.get("content_hash") != content_hash
+                    if changed:
+                        version = int(current.get("version", 0)) + 1
+                        last_modified = time.time()
+                    else:
+                        version = int(current["version"])
+                        last_modified = float(current["last_modified"])
+
+                    pipe.multi()
+                    if changed:
+                        pipe.hset(key, mapping={
+                            "version": version,
+                            "content_hash": content_hash,
+                            "last_modified": last_modified,
+                        })
+                    pipe.set(
+                        self._get_catalog_key(),
+                        self._pack(
+                            catalog_json,
+                            version=version,
+                            last_modified=last_modified,
+                            etag=f'"{version}-{content_hash}"',
+                        ),
+                        ex=TTL_SECONDS,
+                    )
+                    await pipe.execute()
+                    break
+
+                except WatchError:
+                    continue
+
+        if changed:
+            logging.info(f"Catálogo alterado, nova versão {version}")
+        return version
+
     async def get(self, id_api: int) -> Optional[ProductResponse]:
+        product, _ = await self.get_with_staleness(id_api)
+        return product
+
+    async def get_with_staleness(self, id_api: int) -> Tuple[Optional[ProductResponse], bool]:
+        """Retorna o produto e se ele já passou do soft TTL."""
         try:
-            key = self._get_key(id_api)
-            product_json = await self.r.get(key)
-            if product_json:
-                product_dict = json.loads(product_json)
-                return mapper_dict_to_product(product_dict)
-            return None
+            entry = await self.get_entry(id_api)
+            if entry:
+                product_dict = json.loads(entry.body)
+                return mapper_dict_to_product(product_dict), entry.is_stale
+            return None, False
 
         except Exception:
+            return None, False
+
+    async def get_entry(self, id_api: int) -> Optional[CacheEntry]:
+        """Retorna o JSON do produto pronto para ser enviado, sem desserializar."""
+        try:
+            value = await self.r.get(self._get_key(id_api))
+            entry = self._unpack(value) if value else None
+
+        except Exception:
+            CACHE_RESULTS["product", "error"].inc()
             return None
 
+        CACHE_RESULTS["product", "hit" if entry else "miss"].inc()
+        return entry
+
     async def get_all(self) -> List[ProductResponse]:
+        products, _ = await self.get_all_with_staleness()
+        return products
+
+    async def get_all_with_staleness(self) -> Tuple[List[ProductResponse], bool]:
+        """Retorna os produtos e se o catálogo já passou do soft TTL."""
         try:
-            pattern = f"{self.keyspace}:*"
-            keys = []
-            async for key in self.r.scan_iter(match=pattern):
-                keys.append(key)
-            
-            if not keys:
-                return []
-            
-            # Buscar todos os valores de uma vez
-            values = await self.r.mget(keys)
-            
-            products = []
-            for value in values:
-                if value:
-                    try:
-                        product_dict = json.loads(value)
-                        products.append(mapper_dict_to_product(product_dict))
-                    except Exception:
-                        continue
-            
-            return products
-            
+            catalog = await self.get_catalog()
+            if not catalog:
+                return [], False
+
+            products = [
+                mapper_dict_to_product(product_dict)
+                for product_dict in json.loads(catalog.body)
+            ]
+            return products, catalog.is_stale
+
         except Exception:
-            return []
+            return [], False
+
+    async def get_catalog(self, raise_errors: bool = False) -> Optional[CacheEntry]:
+        """
+        Retorna o cabeçalho (versão, soft TTL, ETag) e o JSON do catálogo pronto
+        para ser enviado, em uma única leitura no Redis.
+
+        Com raise_errors, falhas do Redis são propagadas em vez de parecerem cache miss.
+        """
+        try:
+            value = await self.r.get(self._get_catalog_key())
+            entry = self._unpack(value) if value else None
+
+        except Exception:
+            CACHE_RESULTS["catalog", "error"].inc()
+            if raise_errors:
+                raise
+            return None
+
+        CACHE_RESULTS["catalog", "hit" if entry else "miss"].inc()
+        return entry
+
+    async def acquire_refresh_lock(self, name: Any) -> bool:
+        """
+        Garante que apenas uma atualização em background seja disparada por chave
+        enquanto o lock estiver ativo.
+        """
+        try:
+            key = self._get_refresh_key(name)
+            return bool(await self.r.set(key, 1, nx=True, ex=REFRESH_LOCK_TTL_SECONDS))
+
+        except Exception as e:
+            logging.info(f"Erro ao obter lock de atualização {name} no Redis: {e}")
+            return False
@@ -1,8 +1,8 @@
-from typing import List
+from typing import List, Optional, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.v1._shared.schemas import ProductResponse
+from api.v1._shared.schemas import ProductFilter, ProductResponse
 from api.v1.fakestoreapi.mapper import (
     mapper_list_products_to_list_dict,
     mapper_product_to_dict,
@@ -12,10 +12,18 @@ from api.v1.fakestoreapi.services.background_task import (
     save_or_update_product_task,
     save_or_update_products_in_database_sql_task,
 )
-from api.v1.fakestoreapi.services.background_task import get_products_api
-from api.v1.fakestoreapi.services.redis import RedisService
+from api.v1.fakestoreapi.services.background_task import get_product_api, get_products_api
+from api.v1.fakestoreapi.services.catalog_index import CatalogSnapshot, catalog_index
+from api.v1.fakestoreapi.services.redis import CacheEntry, RedisService
 from api.v1.fakestoreapi.services.produto_async import ProductService
+from api.utils.celery import SCHEDULED_SYNC_ENABLED
 from api.utils.exceptions import exception_404_NOT_FOUND
+from api.utils.single_flight import SingleFlight
+from api.utils.tracing import start_span
+
+# Compartilhado entre as requisições do worker para coalescer cache misses
+product_single_flight = SingleFlight(name="product")
+
 
 class ProductUseCase:
 
@@ -24,62 +32,149 @@ class ProductUseCase:
         self.serviceAPI = APIService()
         self.serviceRedis = RedisService()
 
+    async def list_cached(self) -> Optional[CacheEntry]:
+        """
+        Caminho rápido: retorna o catálogo já serializado do Redis, sem passar
+        pelo pydantic. Retorna None em cache miss para que o controller use list().
+        """
+        with start_span("product.cache"):
+            catalog = await self.serviceRedis.get_catalog()
+        if catalog:
+            await self._revalidate_list(catalog.is_stale)
+        return catalog
+
+    async def get_cached(self, id: int) -> Optional[CacheEntry]:
+        """Caminho rápido de get(): JSON do produto direto do Redis ou None."""
+        with start_span("product.cache", product_id=id):
+            entry = await self.serviceRedis.get_entry(id)
+        if entry:
+            await self._revalidate_product(id, entry.is_stale)
+        return entry
+
     async def list(self) -> List[ProductResponse]:
         """
         Estratégia adotada:
-        1 Tenta buscar na Redis
+        1 Tenta buscar na Redis; se o cache passou do soft TTL, dispara uma única atualização em background
         2 Caso não encontre, tenta buscar na API externa e atualizar banco em background
+          (apenas uma busca por vez, as demais requisições aguardam o mesmo resultado)
         3 Se API falhar, continua e retorna produtos do banco local    
         """
-        products = []
-        products_redis = await self.serviceRedis.get_all()
+        with start_span("product.cache"):
+            products_redis, stale = await self.serviceRedis.get_all_with_staleness()
         if products_redis:
-            get_products_api.delay()
+            await self._revalidate_list(stale)
             return products_redis
         
         try:
-            # Buscar produtos da API para atualizar banco em background
-            products = await self.serviceAPI.list()
-            if products:
-                products_dict = mapper_list_products_to_list_dict(products)
-                save_or_update_products_in_database_sql_task.delay(products_dict)
-                await self.serviceRedis.create_or_update_all(products)
+            with start_span("product.refresh"):
+                products = await product_single_flight.do(
+                    f"{self.serviceRedis.keyspace}:list",
+                    self._refresh_list,
+                    redis=self.serviceRedis.r,
+                    wait_result=self.serviceRedis.get_all,
+                )
 
         except Exception:
             # Se API falhar, continuar e retornar do banco local
-            return await self.serviceSQL.list()
+            with start_span("product.db_fallback"):
+                return await self.serviceSQL.list()
         
-        # Sempre retornar produtos do banco local
         return products
 
+    # Com CATALOG_SYNC_MODE=beat a sincronização é apenas agendada:
+    # as requisições nunca enfileiram tasks de sincronização
+    async def _revalidate_list(self, stale: bool) -> None:
+        if SCHEDULED_SYNC_ENABLED:
+            return
+        if stale and await self.serviceRedis.acquire_refresh_lock("list"):
+            with start_span("product.enqueue", task="get_products_api"):
+                get_products_api.delay()
+
+    async def _revalidate_product(self, id: int, stale: bool) -> None:
+        if SCHEDULED_SYNC_ENABLED:
+            return
+        if stale and await self.serviceRedis.acquire_refresh_lock(id):
+            with start_span("product.enqueue", task="get_product_api", product_id=id):
+                get_product_api.delay(id)
+
+    async def _refresh_list(self) -> List[ProductResponse]:
+        # Buscar produtos da API para atualizar banco em background
+        products = await self.serviceAPI.list()
+        if products:
+            if not SCHEDULED_SYNC_ENABLED:
+                with start_span("product.enqueue", task="update_products_task"):
+                    products_dict = mapper_list_products_to_list_dict(products)
+                    save_or_update_products_in_database_sql_task.delay(products_dict)
+            with start_span("product.cache_write"):
+                await self.serviceRedis.create_or_update_all(products)
+        return products
+
+    async def query(
+        self,
+        product_filter: Optional[ProductFilter] = None,
+        skip: int = 0,
+        limit: Optional[int] = None,
+    ) -> Tuple[int, str]:
+        """
+        Filtra, ordena e pagina o catálogo na foto em memória do worker.
+        - foto além do soft TTL: é servida e uma única atualização é disparada em background
+        - sem foto (ou com a chave expirada no Redis): popula o cache pelo list() e usa o resultado dele
+        """
+        snapshot = await catalog_index.get()
+        if snapshot is None:
+            products = await self.list()
+            snapshot = await catalog_index.refresh() or CatalogSnapshot.from_products(products)
+        else:
+            await self._revalidate_list(catalog_index.is_stale)
+        with start_span("product.index_query"):
+            return snapshot.query(product_filter, skip, limit)
+
+    async def search(self, term: str, limit: int = 10) -> List[ProductResponse]:
+        """Busca ranqueada direto no banco local, que é mantido pela sincronização."""
+        return await self.serviceSQL.search(term, limit)
+
     async def get(self, id: int) -> ProductResponse:
         """
         Estratégia semelhante a anterior porem com foco em um produto específico: 
-        1 Tenta buscar na Redis
+        1 Tenta buscar na Redis; se o cache passou do soft TTL, dispara uma única atualização em background
         2 Caso não encontre, tenta buscar na API externa e atualizar banco em background
         3 Se API falhar, continua e retorna produto do banco local    
         """
 
-        product = await self.serviceRedis.get(id)
+        with start_span("product.cache", product_id=id):
+            product, stale = await self.serviceRedis.get_with_staleness(id)
         if product:
-            product_dict = mapper_product_to_dict(product)
-            save_or_update_product_task.delay(product_dict)
-            await self.serviceRedis.create_or_update(id, product)
+            await self._revalidate_product(id, stale)
             return product
 
         try: 
-            product = await self.serviceAPI.get(id)
+            with start_span("product.refresh", product_id=id):
+                product = await product_single_flight.do(
+                    f"{self.serviceRedis.keyspace}:{id}",
+                    lambda: self._refresh_product(id),
+                    redis=self.serviceRedis.r,
+                    wait_result=lambda: self.serviceRedis.get(id),
+                )
             if product:
-                product_dict = mapper_product_to_dict(product)
-                save_or_update_product_task.delay(product_dict)
-                await self.serviceRedis.create_or_update(id, product)
                 return product
         except Exception:
             pass 
 
         try:
-            product = await self.serviceSQL.get_by_id_api(id)
-            return await self.serviceSQL.get(id)
+            with start_span("product.db_fallback", product_id=id):
+                product = await self.serviceSQL.get_by_id_api(id)
+                return await self.serviceSQL.get(id)
         
         except Exception:
             raise exception_404_NOT_FOUND(detail=f"Produto com ID {id} não encontrado")
+
+    async def _refresh_product(self, id: int) -> ProductResponse:
+        product = await self.serviceAPI.get(id)
+        if product:
+            if not SCHEDULED_SYNC_ENABLED:
+                with start_span("product.enqueue", task="update_product_task", product_id=id):
+                    product_dict = mapper_product_to_dict(product)
+                    save_or_update_product_task.delay(product_dict)
+            with start_span("product.cache_write", product_id=id):
+                await self.serviceRedis.create_or_update(id, product)
+        return product
@@ -1,14 +1,15 @@
-from typing import List
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Path, Query
+from fastapi import APIRouter, Depends, Path, Query, Response
 from fastapi_filter import FilterDepends
 from sqlalchemy.orm import Session
 
 from api.utils.db_services import get_db
+from api.utils.pagination import CountMode
 from api.utils.security import get_current_user
 from api.v1._shared.models import User
-from api.v1._shared.schemas import FavoriteResponse, FavoriteFilter, FavoriteUpdate, FavoriteDelete, FavoriteCreate
+from api.v1._shared.schemas import FavoriteResponse, FavoriteFilter, Page, FavoriteUpdate, FavoriteDelete, FavoriteCreate
 from api.v1.favorite.use_case import FavoriteUseCase
 
 
@@ -18,31 +19,43 @@ router = APIRouter(
 )
 
 
-@router.get("", response_model=List[FavoriteResponse])
+@router.get("", response_model=Page[FavoriteResponse])
 async def list(
+    response: Response,
     skip: int = Query(0, ge=0, description="Número de registros para pular"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (header X-Next-Cursor)"),
     limit: int = Query(10, ge=1, le=100, description="Número máximo de registros a retornar"),
+    count: Optional[CountMode] = Query(None, description="Incluir total: estimate (planner) ou exact (COUNT)"),
     favorite_filter: FavoriteFilter = FilterDepends(FavoriteFilter),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
-) -> List[FavoriteResponse]:
+) -> Page[FavoriteResponse]:
     """
     Listar favoritos do usuário logado com filtros, ordenação e busca
     
-    - skip: Número de registros para pular, o padrão é 0
+    - skip: Número de registros para pular, o padrão é 0 (ignorado quando cursor é enviado)
+    - cursor: Cursor opaco recebido no header X-Next-Cursor da página anterior;
+      disponível apenas com a ordenação padrão (sem order_by)
     - limit: Número máximo de registros a retornar (padrão: 10, máximo: 100)
+    - count: estimate retorna o total previsto pelo planner, sem custo extra;
+      exact executa um COUNT(*) da consulta filtrada
     - Filtros disponíveis via query params:
         - review__ilike: Busca parcial na review (case-insensitive)
         - search: Busca textual nos campos review
         - order_by: Ordenação (ex: order_by=review ou order_by=-created_at)
     """
     use_case = FavoriteUseCase(db)
-    return await use_case.list(
+    page = await use_case.list(
         skip=skip,
         limit=limit,
         favorite_filter=favorite_filter,
         current_user=current_user,
+        cursor=cursor,
+        count=count,
     )
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page
 
 
 @router.get("/{id}", response_model=FavoriteResponse)
@@ -1,11 +1,23 @@
-from api.v1._shared.models import Favorite
+from sqlalchemy import Row
+
+from api.v1._shared.models import Favorite, Product
 from api.v1._shared.schemas import FavoriteResponse
 
-def mapper_favorite_to_favorite_response(favorite: Favorite) -> FavoriteResponse:
+def mapper_favorite_to_favorite_response(favorite: Favorite, product: Product) -> FavoriteResponse:
     return FavoriteResponse(
         id=favorite.id,
-        title=favorite.product.title,
-        image=favorite.product.image,
-        price=favorite.product.price,
+        title=product.title,
+        image=product.image,
+        price=product.price,
         review=favorite.review
-    )
\ No newline at end of file
+    )
+
+def mapper_favorite_row_to_favorite_response(row: Row) -> FavoriteResponse:
+    # Linha da consulta projetada de FavoriteService (favorito + colunas do produto)
+    return FavoriteResponse(
+        id=row.id,
+        title=row.title,
+        image=row.image,
+        price=row.price,
+        review=row.review
+    )
@@ -1,7 +1,7 @@
-from typing import List
+from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Select, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -9,16 +9,21 @@ from api.utils.exceptions import (
     exception_400_BAD_REQUEST,
     exception_404_NOT_FOUND,
 )
-from api.v1._shared.models import User, Favorite
+from api.utils.pagination import CountMode, apply_keyset, build_page, count_rows
+from api.v1._shared.models import User, Favorite, Product
 from api.v1._shared.schemas import (
     FavoriteResponse,
     FavoriteFilter,
     FavoriteCreate,
     FavoriteUpdate,
     FavoriteDelete,
+    Page,
 )
 from api.v1.fakestoreapi.services.produto_async import ProductService
-from api.v1.favorite.mapper import mapper_favorite_to_favorite_response
+from api.v1.favorite.mapper import (
+    mapper_favorite_row_to_favorite_response,
+    mapper_favorite_to_favorite_response,
+)
 from api.v1.user.service import UserService
 
 
@@ -29,18 +34,35 @@ class FavoriteService:
         self.serviceProduct = ProductService(db)
         self.serviceUser = UserService(db)
 
+    @staticmethod
+    def _select_response() -> Select:
+        """
+        Consulta única com join no produto, trazendo apenas as colunas de
+        FavoriteResponse (e created_at para o cursor) em vez das entidades completas.
+        """
+        return select(
+            Favorite.id,
+            Favorite.created_at,
+            Favorite.review,
+            Product.title,
+            Product.image,
+            Product.price,
+        ).join(Product, Favorite.product_id == Product.id)
+
     async def list(
         self,
         skip: int = 0,
         limit: int = 10,
         favorite_filter: FavoriteFilter = None,
-        current_user: User = None
-    ) -> List[FavoriteResponse]:
+        current_user: User = None,
+        cursor: Optional[str] = None,
+        count: Optional[CountMode] = None,
+    ) -> Page[FavoriteResponse]:
 
         if "ADMIN"  in current_user.permissions:
-            query = select(Favorite).where(Favorite.flg_deleted == False)
+            query = self._select_response().where(Favorite.flg_deleted == False)
         else:
-            query = select(Favorite).where(
+            query = self._select_response().where(
                 Favorite.flg_deleted == False, 
                 Favorite.user_id == current_user.id
             )
@@ -48,40 +70,58 @@ class FavoriteService:
         if favorite_filter:
             query = favorite_filter.filter(query)
             query = favorite_filter.sort(query)
-        
-        if favorite_filter is None or not favorite_filter.order_by:
-            query = query.order_by(Favorite.created_at.desc())
 
-        result = await self.db.execute(query.offset(skip).limit(limit))
-        favorites = result.scalars().all()
+        total, total_is_estimate = await count_rows(self.db, query, count)
+        
+        # Ordenação padrão usa keyset em (created_at, id); o cursor só vale para ela.
+        # Uma linha a mais é buscada apenas para saber se existe próxima página
+        keyset = favorite_filter is None or not favorite_filter.order_by
+        if keyset:
+            query = apply_keyset(query, Favorite, cursor, limit + 1)
+            if not cursor:
+                query = query.offset(skip)
+        elif cursor:
+            raise exception_400_BAD_REQUEST(detail="cursor não pode ser combinado com order_by")
+        else:
+            query = query.offset(skip).limit(limit + 1)
 
-        return favorites
+        result = await self.db.execute(query)
+        favorites = result.all()
+
+        return build_page(
+            favorites,
+            limit,
+            mapper_favorite_row_to_favorite_response,
+            keyset=keyset,
+            total=total,
+            total_is_estimate=total_is_estimate,
+        )
 
 
     async def get(self, id: UUID, current_user: User) -> FavoriteResponse:   
 
         if "ADMIN" in current_user.permissions:
-            query = select(Favorite).where(
+            query = self._select_response().where(
                 Favorite.flg_deleted == False,
                 Favorite.id == id
             )
         else:
-            query = select(Favorite).where(
+            query = self._select_response().where(
                 Favorite.id == id,
                 Favorite.flg_deleted == False,
                 Favorite.user_id == current_user.id
             )
 
         result = await self.db.execute(query)
-        favorite = result.scalar_one_or_none()
+        favorite = result.one_or_none()
         
         if not favorite:
             raise exception_404_NOT_FOUND(detail=f"Favorito com ID {id} não encontrado")
         
-        return favorite
+        return mapper_favorite_row_to_favorite_response(favorite)
     
     async def favorite_exists(self, product_id: UUID, current_user: User) -> bool:
-        query = select(Favorite).where(
+        query = select(Favorite.id).where(
             Favorite.product_id == product_id,
             Favorite.flg_deleted == False,
             Favorite.user_id == current_user.id
@@ -114,7 +154,7 @@ class FavoriteService:
             await self.db.rollback()
             raise exception_400_BAD_REQUEST(detail=f"Erro ao criar favorito: {str(e)}")
 
-        return new_favorite
+        return mapper_favorite_to_favorite_response(new_favorite, product)
 
     async def update(self, favorite: FavoriteUpdate, current_user: User) -> FavoriteResponse:
         query = select(Favorite).where(
@@ -136,15 +176,16 @@ class FavoriteService:
             setattr(existing_favorite, field, value)
         
         await self.db.commit()
-        await self.db.refresh(existing_favorite)
         
-        return mapper_favorite_to_favorite_response(existing_favorite)
+        return await self.get(existing_favorite.id, current_user)
 
     async def delete(self, id: UUID, current_user: User) -> FavoriteResponse:
 
         favorite = await self.get(id, current_user)
         
-        favorite.flg_deleted = True
+        await self.db.execute(
+            update(Favorite).where(Favorite.id == favorite.id).values(flg_deleted=True)
+        )
         await self.db.commit()
         
         return favorite
\ No newline at end of file
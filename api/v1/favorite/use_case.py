@@ -1,4 +1,4 @@
-from typing import List
+from typing import Optional
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -9,6 +9,7 @@ from api.v1._shared.schemas import (
     FavoriteResponse,
     FavoriteUpdate,
     FavoriteCreate,
+    Page,
     User,
 )
 from api.v1.favorite.service import FavoriteService
@@ -16,7 +17,7 @@ from api.v1.fakestoreapi.services.redis import RedisService
 from api.v1.fakestoreapi.services.api import APIService
 from api.v1.fakestoreapi.services.produto_async import ProductService
 from api.utils.exceptions import exception_404_NOT_FOUND
-from api.v1.favorite.mapper import mapper_favorite_to_favorite_response
+from api.utils.pagination import CountMode
 
 class FavoriteUseCase:
 
@@ -31,18 +32,20 @@ class FavoriteUseCase:
         skip: int = 0,
         limit: int = 10,
         favorite_filter: FavoriteFilter = None,
-        current_user: User = None
-    ) -> List[FavoriteResponse]:
-        favorites = await self.serviceFavorite.list(
+        current_user: User = None,
+        cursor: Optional[str] = None,
+        count: Optional[CountMode] = None,
+    ) -> Page[FavoriteResponse]:
+        return await self.serviceFavorite.list(
             skip=skip,
             limit=limit,
             favorite_filter=favorite_filter,
-            current_user=current_user)
-        return [mapper_favorite_to_favorite_response(favorite) for favorite in favorites]
+            current_user=current_user,
+            cursor=cursor,
+            count=count)
 
     async def get(self, id: UUID, current_user: User) -> FavoriteResponse:
-        favorite = await self.serviceFavorite.get(id, current_user)
-        return mapper_favorite_to_favorite_response(favorite)
+        return await self.serviceFavorite.get(id, current_user)
 
     async def create(self, favorite: FavoriteCreate, current_user: User) -> FavoriteResponse:
         """
@@ -71,8 +74,7 @@ class FavoriteUseCase:
                     product_exists = True
         
         if product_exists:
-            favorite = await self.serviceFavorite.create(favorite, current_user)
-            return mapper_favorite_to_favorite_response(favorite)
+            return await self.serviceFavorite.create(favorite, current_user)
         else:
             raise exception_404_NOT_FOUND(detail=f"Produto com ID {favorite.api_id} não encontrado")
 
@@ -81,5 +83,4 @@ class FavoriteUseCase:
         return updated_favorite
 
     async def delete(self, favorite_id: UUID, current_user: User) -> FavoriteResponse:
-        deleted_favorite = await self.serviceFavorite.delete(favorite_id, current_user)
-        return mapper_favorite_to_favorite_response(deleted_favorite)
+        return await self.serviceFavorite.delete(favorite_id, current_user)
@@ -1,14 +1,15 @@
-from typing import List
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Path, Query
+from fastapi import APIRouter, Depends, Path, Query, Response
 from fastapi_filter import FilterDepends
 from sqlalchemy.orm import Session
 
 from api.utils.db_services import get_db
+from api.utils.pagination import CountMode
 from api.utils.security import get_current_user
 from api.v1._shared.models import User
-from api.v1._shared.schemas import UserDelete, UserResponse, UserUpdate, UserFilter
+from api.v1._shared.schemas import Page, UserDelete, UserResponse, UserUpdate, UserFilter
 from api.v1.user.use_case import UserUseCase
 
 
@@ -18,19 +19,26 @@ router = APIRouter(
 )
 
 
-@router.get("", response_model=List[UserResponse])
+@router.get("", response_model=Page[UserResponse])
 async def list(
+    response: Response,
     skip: int = Query(0, ge=0, description="Número de registros para pular"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (header X-Next-Cursor)"),
     limit: int = Query(10, ge=1, le=100, description="Número máximo de registros a retornar"),
+    count: Optional[CountMode] = Query(None, description="Incluir total: estimate (planner) ou exact (COUNT)"),
     user_filter: UserFilter = FilterDepends(UserFilter),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
-) -> List[UserResponse]:
+) -> Page[UserResponse]:
     """
     Listar usuários com filtros, ordenação e busca
     
-    - skip: Número de registros para pular, o padrão é 0
+    - skip: Número de registros para pular, o padrão é 0 (ignorado quando cursor é enviado)
+    - cursor: Cursor opaco recebido no header X-Next-Cursor da página anterior;
+      disponível apenas com a ordenação padrão (sem order_by)
     - limit: Número máximo de registros a retornar (padrão: 10, máximo: 100)
+    - count: estimate retorna o total previsto pelo planner, sem custo extra;
+      exact executa um COUNT(*) da consulta filtrada
     - Filtros disponíveis via query params:
         - name__ilike: Busca parcial no nome (case-insensitive)
         - email__ilike: Busca parcial no email (case-insensitive)
@@ -38,11 +46,16 @@ async def list(
         - order_by: Ordenação (ex: order_by=name ou order_by=-created_at)
     """
     use_case = UserUseCase(db)
-    return await use_case.list(
+    page = await use_case.list(
         skip=skip,
         limit=limit,
-        user_filter=user_filter
+        user_filter=user_filter,
+        cursor=cursor,
+        count=count,
     )
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page
 
 
 @router.get("/{id}", response_model=UserResponse)
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Optional
 from uuid import UUID
 
 from sqlalchemy import select
@@ -10,7 +10,9 @@ from api.utils.exceptions import (
     exception_401_UNAUTHORIZED,
     exception_404_NOT_FOUND,
 )
-from api.utils.security import get_password_hash, verify_password
+from api.utils.pagination import CountMode, apply_keyset, build_page, count_rows
+from api.utils.security import get_password_hash_async, revoke_tokens, verify_password_async
+from api.utils.user_cache import user_cache
 from api.v1._shared.models import User
 from api.v1._shared.schemas import (
     UserCreate,
@@ -18,6 +20,7 @@ from api.v1._shared.schemas import (
     UserFilter,
     UserResponse,
     UserUpdate,
+    Page,
 )
 from api.v1.user.mapper import mapper_user_to_user_response
 
@@ -31,8 +34,10 @@ class UserService:
         self,
         skip: int = 0,
         limit: int = 10,
-        user_filter: UserFilter = None
-    ) -> List[UserResponse]:
+        user_filter: UserFilter = None,
+        cursor: Optional[str] = None,
+        count: Optional[CountMode] = None,
+    ) -> Page[UserResponse]:
         # Listagem com paginação, ordenação e filtros usando fastapi-filter
         query = select(User).where(User.flg_deleted == False)
 
@@ -40,17 +45,33 @@ class UserService:
         if user_filter:
             query = user_filter.filter(query)
             query = user_filter.sort(query)
+
+        total, total_is_estimate = await count_rows(self.db, query, count)
         
-        # Se não houver ordenação do filtro, aplicar padrão
-        if user_filter is None or not user_filter.order_by:
-            query = query.order_by(User.created_at.desc())
+        # Sem ordenação do filtro, paginação por keyset em (created_at, id);
+        # o cursor só vale para essa ordenação. A linha extra indica se há próxima página
+        keyset = user_filter is None or not user_filter.order_by
+        if keyset:
+            query = apply_keyset(query, User, cursor, limit + 1)
+            if not cursor:
+                query = query.offset(skip)
+        elif cursor:
+            raise exception_400_BAD_REQUEST(detail="cursor não pode ser combinado com order_by")
+        else:
+            query = query.offset(skip).limit(limit + 1)
 
-        # Aplicar paginação
-        result = await self.db.execute(query.offset(skip).limit(limit))
+        result = await self.db.execute(query)
         users = result.scalars().all()
 
         # Converter para schema de resposta
-        return [mapper_user_to_user_response(user) for user in users]
+        return build_page(
+            users,
+            limit,
+            mapper_user_to_user_response,
+            keyset=keyset,
+            total=total,
+            total_is_estimate=total_is_estimate,
+        )
 
 
     async def get(self, id: UUID) -> UserResponse:
@@ -95,7 +116,7 @@ class UserService:
             raise exception_401_UNAUTHORIZED(detail="Email ou senha incorretos")
 
         # Verificar senha
-        if not verify_password(password, user.password):
+        if not await verify_password_async(password, user.password):
             raise exception_401_UNAUTHORIZED(detail="Email ou senha incorretos")
         
         # Retorna usuário
@@ -117,7 +138,7 @@ class UserService:
             raise exception_400_BAD_REQUEST(detail=f"Email {email_lower} já está em uso")
         
         # Hash da senha
-        hashed_password = get_password_hash(obj.password)
+        hashed_password = await get_password_hash_async(obj.password)
         
         # Criar usuário
         new_user = User(
@@ -157,10 +178,16 @@ class UserService:
         
         # Password precisa de hash especial
         if obj.password is not None:
-            user.password = get_password_hash(obj.password)
+            user.password = await get_password_hash_async(obj.password)
+
+        # Troca de senha ou de permissões revoga os tokens já emitidos. Antes do commit:
+        # se a revogação falhar (503) a alteração não é gravada
+        if obj.password is not None or "permissions" in update_data:
+            await revoke_tokens(user.id)
         
         await self.db.commit()
         await self.db.refresh(user)
+        await user_cache.invalidate(user.id)
         
         return mapper_user_to_user_response(user)
 
@@ -172,10 +199,12 @@ class UserService:
         result = await self.db.execute(query)
         user = result.scalar_one_or_none()
         
-        if not verify_password(obj.password, user.password):
+        if not await verify_password_async(obj.password, user.password):
             raise exception_401_UNAUTHORIZED(detail="Senha incorreta")
         
+        await revoke_tokens(user.id)
         user.flg_deleted = True
         await self.db.commit()
+        await user_cache.invalidate(user.id)
         
         return mapper_user_to_user_response(user)
\ No newline at end of file
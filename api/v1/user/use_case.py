@@ -1,10 +1,11 @@
-from typing import List
+from typing import Optional
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.v1._shared.schemas import (
     UserDelete,
+    Page,
     UserFilter,
     UserResponse,
     UserUpdate,
@@ -12,6 +13,7 @@ from api.v1._shared.schemas import (
 from api.v1.user.service import UserService
 from api.v1._shared.models import User
 from api.utils.exceptions import exception_403_FORBIDDEN
+from api.utils.pagination import CountMode
 
 class UserUseCase:
 
@@ -22,12 +24,16 @@ class UserUseCase:
         self,
         skip: int = 0,
         limit: int = 10,
-        user_filter: UserFilter = None
-    ) -> List[UserResponse]:
+        user_filter: UserFilter = None,
+        cursor: Optional[str] = None,
+        count: Optional[CountMode] = None,
+    ) -> Page[UserResponse]:
         return await self.service.list(
             skip=skip,
             limit=limit,
-            user_filter=user_filter
+            user_filter=user_filter,
+            cursor=cursor,
+            count=count,
         )
 
     async def get(self, id: UUID) -> UserResponse:
@@ -1,14 +1,28 @@
+from contextlib import asynccontextmanager
 from datetime import datetime
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
+from api.utils.metrics import MetricsMiddleware, metrics_registry
+from api.utils.resources import app_resources
+from api.utils.tracing import instrument_app, setup_tracing
 from api.v1.router import routes
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pools, aquecimento e encerramento ficam no container de recursos
+    await app_resources.startup()
+    yield
+    await app_resources.shutdown()
+
+
 app = FastAPI(
     title="Fakestore API - FastAPI", 
-    version="0.0.1"
+    version="0.0.1",
+    lifespan=lifespan,
 )
 
 origins = ["*"]
@@ -19,10 +33,32 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Cursor da paginação por keyset, lido pelo front na listagem
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],
 )
 
+# Latência por rota e consultas SQL por requisição
+app.add_middleware(MetricsMiddleware)
+
+# Tracing opcional (TRACING_ENABLED), antes de a aplicação montar a pilha de middlewares
+if setup_tracing():
+    instrument_app(app)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(generate_latest(metrics_registry()), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.get("/health", summary="Show API Status")
-async def health_check():
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+async def health_check(response: Response):
+    # Pronto apenas depois do aquecimento: o balanceador não envia tráfego para um worker frio
+    if not app_resources.ready:
+        response.status_code = 503
+    return {
+        "status": "healthy" if app_resources.ready else "starting",
+        "timestamp": datetime.now().isoformat(),
+        **app_resources.status(),
+    }
 
 app.include_router(routes)
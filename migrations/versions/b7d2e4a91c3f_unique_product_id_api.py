@@ -0,0 +1,72 @@
+"""unique product id_api
+
+Revision ID: b7d2e4a91c3f
+Revises: 2312760d89d5
+Create Date: 2026-10-17 10:12:31.482910
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e4a91c3f'
+down_revision: Union[str, Sequence[str], None] = '2312760d89d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conn = op.get_bind()
+
+    # Remove duplicados de id_api antes de criar o índice único,
+    # apontando os favoritos para o produto mantido
+    conn.execute(
+        sa.text(
+            """
+            CREATE TEMP TABLE product_duplicates ON COMMIT DROP AS
+            SELECT id, keep_id
+            FROM (
+                SELECT
+                    id,
+                    FIRST_VALUE(id) OVER (
+                        PARTITION BY id_api
+                        ORDER BY flg_deleted ASC, updated_at DESC
+                    ) AS keep_id
+                FROM product
+            ) ranked
+            WHERE id <> keep_id
+            """
+        )
+    )
+    conn.execute(
+        sa.text(
+            """
+            UPDATE favorite f
+            SET product_id = d.keep_id
+            FROM product_duplicates d
+            WHERE f.product_id = d.id
+            """
+        )
+    )
+    conn.execute(
+        sa.text(
+            """
+            DELETE FROM product p
+            USING product_duplicates d
+            WHERE p.id = d.id
+            """
+        )
+    )
+
+    op.drop_index(op.f('ix_product_id_api'), table_name='product')
+    op.create_index(op.f('ix_product_id_api'), 'product', ['id_api'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_product_id_api'), table_name='product')
+    op.create_index(op.f('ix_product_id_api'), 'product', ['id_api'], unique=False)
@@ -0,0 +1,60 @@
+"""keyset pagination indexes
+
+Revision ID: d9e3b5f7a1c2
+Revises: c4a8f1d6e2b5
+Create Date: 2026-10-17 11:48:06.530417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9e3b5f7a1c2'
+down_revision: Union[str, Sequence[str], None] = 'c4a8f1d6e2b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# As listagens sempre filtram flg_deleted = false: registros excluídos ficam fora dos índices
+NOT_DELETED = sa.text('flg_deleted = false')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY não roda dentro de transação e não bloqueia escritas.
+    # Se falhar, o índice fica INVALID: remova-o e rode a migration novamente
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_created_at_id',
+            'user',
+            [sa.text('created_at DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_where=NOT_DELETED,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_favorite_created_at_id',
+            'favorite',
+            [sa.text('created_at DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_where=NOT_DELETED,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_favorite_user_id_created_at_id',
+            'favorite',
+            ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_where=NOT_DELETED,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_favorite_user_id_created_at_id', table_name='favorite', postgresql_concurrently=True)
+        op.drop_index('ix_favorite_created_at_id', table_name='favorite', postgresql_concurrently=True)
+        op.drop_index('ix_user_created_at_id', table_name='user', postgresql_concurrently=True)
@@ -0,0 +1,71 @@
+"""favorite unique partial index
+
+Revision ID: e2f8c6a4b0d1
+Revises: d9e3b5f7a1c2
+Create Date: 2026-10-17 12:21:40.907356
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2f8c6a4b0d1'
+down_revision: Union[str, Sequence[str], None] = 'd9e3b5f7a1c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NOT_DELETED = sa.text('flg_deleted = false')
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+DEDUPE_FAVORITES = """
+    UPDATE favorite f
+    SET flg_deleted = true
+    FROM (
+        SELECT
+            id,
+            ROW_NUMBER() OVER (
+                PARTITION BY user_id, product_id
+                ORDER BY created_at DESC, id DESC
+            ) AS position
+        FROM favorite
+        WHERE flg_deleted = false
+    ) ranked
+    WHERE f.id = ranked.id AND ranked.position > 1
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Mantém apenas o favorito mais recente por (user_id, product_id) antes do índice único
+    if context.is_offline_mode():
+        op.execute(DEDUPE_FAVORITES)
+    else:
+        result = op.get_bind().execute(sa.text(DEDUPE_FAVORITES))
+        logger.info(f"Favoritos duplicados marcados como deletados: {result.rowcount}")
+
+    # CREATE INDEX CONCURRENTLY não roda dentro de transação e não bloqueia escritas.
+    # Se falhar, o índice fica INVALID: remova-o e rode a migration novamente
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_favorite_user_id_product_id',
+            'favorite',
+            ['user_id', 'product_id'],
+            unique=True,
+            postgresql_where=NOT_DELETED,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_favorite_user_id_product_id',
+            table_name='favorite',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,77 @@
+"""product search indexes
+
+Revision ID: f5a1d7c3e9b4
+Revises: e2f8c6a4b0d1
+Create Date: 2026-10-17 13:05:17.264019
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5a1d7c3e9b4'
+down_revision: Union[str, Sequence[str], None] = 'e2f8c6a4b0d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PRODUCT_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(category, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+# Só colunas consultadas no banco: o título pela busca ranqueada (<%) e a review pelo
+# filtro review__ilike. Os filtros do catálogo rodam no índice em memória e um GIN
+# em description/category só encareceria cada upsert da sincronização
+TRGM_INDEXES = [
+    ('ix_product_title_trgm', 'product', 'title'),
+    ('ix_favorite_review_trgm', 'favorite', 'review'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # Coluna gerada STORED reescreve a tabela de produtos (bloqueio durante a migration)
+    op.add_column(
+        'product',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(PRODUCT_SEARCH_VECTOR, persisted=True),
+            nullable=True,
+        ),
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_product_search_vector',
+            'product',
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+        for name, table, column in TRGM_INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(TRGM_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+        op.drop_index('ix_product_search_vector', table_name='product', postgresql_concurrently=True)
+    op.drop_column('product', 'search_vector')
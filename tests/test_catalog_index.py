@@ -0,0 +1,118 @@
+import asyncio
+import json
+
+import pytest
+
+from api.v1._shared.schemas import ProductResponse
+from api.v1.fakestoreapi.services.catalog_index import CatalogIndex
+from api.v1.fakestoreapi.services.redis import RedisService
+
+
+pytestmark = pytest.mark.anyio
+
+
+def _products(*titles):
+    return [
+        ProductResponse(
+            id_api=position,
+            title=title,
+            price=10.0 * position,
+            description="",
+            category="test",
+            image="https://example.com/image.jpg",
+            rate=4.0,
+            count=1,
+        )
+        for position, title in enumerate(titles, start=1)
+    ]
+
+
+@pytest.fixture
+def service(redis, monkeypatch):
+    # O índice cria os próprios RedisService e a inscrição pelo pool compartilhado
+    monkeypatch.setattr("api.v1.fakestoreapi.services.redis.get_redis", lambda: redis)
+    monkeypatch.setattr("api.v1.fakestoreapi.services.catalog_index.get_redis", lambda: redis)
+    monkeypatch.setattr("api.v1.fakestoreapi.services.catalog_index.CATALOG_INDEX_POLL_INTERVAL", 0.01)
+    return RedisService(redis)
+
+
+async def test_catalog_version_only_changes_with_content(service):
+    await service.create_or_update_all(_products("a", "b"))
+    first = await service.get_catalog()
+    await service.create_or_update_all(_products("a", "b"))
+    same = await service.get_catalog()
+    await service.create_or_update_all(_products("a", "c"))
+    changed = await service.get_catalog()
+
+    assert first.header["version"] == same.header["version"] == 1
+    assert first.etag == same.etag
+    assert changed.header["version"] == 2
+    assert changed.etag != first.etag
+
+
+async def test_concurrent_writes_get_distinct_versions(service):
+    await asyncio.gather(*(service.create_or_update_all(_products(f"p{i}")) for i in range(5)))
+
+    versions = await service.r.hgetall(service._get_catalog_version_key())
+    assert versions["version"] == "5"
+
+
+async def test_index_loads_snapshot_from_redis(service):
+    await service.create_or_update_all(_products("a", "b"))
+    index = CatalogIndex()
+
+    snapshot = await index.get()
+
+    assert snapshot.size == 2
+    assert snapshot.version == 1
+    assert not index.is_stale
+
+
+async def test_index_drops_snapshot_when_the_catalog_expired(service):
+    await service.create_or_update_all(_products("a"))
+    index = CatalogIndex()
+    await index.get()
+
+    await service.r.delete(service._get_catalog_key())
+    index._expires_at = 0
+
+    assert await index.get() is None
+
+
+async def test_index_keeps_snapshot_when_redis_is_unavailable(service, monkeypatch):
+    await service.create_or_update_all(_products("a"))
+    index = CatalogIndex()
+    snapshot = await index.get()
+
+    async def unavailable(*args, **kwargs):
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(service.r, "get", unavailable)
+    index._expires_at = 0
+
+    assert await index.get() is snapshot
+    assert not index.is_expired
+
+
+async def test_listener_refreshes_on_published_version(service):
+    await service.create_or_update_all(_products("a"))
+    index = CatalogIndex()
+    index._task = asyncio.create_task(index._listen())
+    try:
+        for _ in range(100):
+            if index.snapshot is not None:
+                break
+            await asyncio.sleep(0.01)
+        assert index.snapshot.size == 1
+
+        await service.create_or_update_all(_products("a", "b", "c"))
+        for _ in range(100):
+            if index.snapshot.version == 2:
+                break
+            await asyncio.sleep(0.01)
+
+        assert index.snapshot.version == 2
+        _, body = index.snapshot.query()
+        assert [product["title"] for product in json.loads(body)] == ["a", "b", "c"]
+    finally:
+        await index.stop()
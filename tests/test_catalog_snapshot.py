@@ -0,0 +1,110 @@
+import json
+
+import pytest
+
+from api.v1._shared.schemas import ProductFilter
+from api.v1.fakestoreapi.services.catalog_index import CatalogSnapshot
+
+
+def _product(id_api, title, category, price, description="", rate=4.0, count=10):
+    return {
+        "id_api": id_api,
+        "title": title,
+        "price": price,
+        "description": description,
+        "category": category,
+        "image": f"https://example.com/{id_api}.jpg",
+        "rate": rate,
+        "count": count,
+    }
+
+
+PRODUCTS = [
+    _product(1, "Mens Cotton Jacket", "men's clothing", 55.99, "great outerwear jackets"),
+    _product(2, "Slim Fit T-Shirt", "men's clothing", 22.3, "slim-fitting style"),
+    _product(3, "Gold Ring", "jewelery", 168.0, "classic wedding ring"),
+    _product(4, "SSD 1TB", "electronics", 109.0, "fast storage", rate=4.8),
+    _product(5, "Rain Jacket Women", "women's clothing", 39.99, "lightweight raincoat"),
+]
+
+
+@pytest.fixture(scope="module")
+def snapshot():
+    return CatalogSnapshot(PRODUCTS, version=3, etag='"3-abc"')
+
+
+def _ids(body: str):
+    return [product["id_api"] for product in json.loads(body)]
+
+
+def test_without_filter_returns_everything_in_catalog_order(snapshot):
+    total, body = snapshot.query()
+
+    assert total == 5
+    assert _ids(body) == [1, 2, 3, 4, 5]
+    assert json.loads(body)[0] == PRODUCTS[0]
+
+
+def test_pagination_keeps_the_filtered_total(snapshot):
+    total, body = snapshot.query(None, skip=1, limit=2)
+
+    assert total == 5
+    assert _ids(body) == [2, 3]
+
+
+def test_ilike_is_case_insensitive_substring(snapshot):
+    total, body = snapshot.query(ProductFilter(title__ilike="JACKET"))
+
+    assert total == 2
+    assert _ids(body) == [1, 5]
+
+
+def test_ilike_with_wildcards_matches_whole_value(snapshot):
+    _, prefix = snapshot.query(ProductFilter(title__ilike="gold%"))
+    _, single_char = snapshot.query(ProductFilter(title__ilike="ssd _tb"))
+
+    assert _ids(prefix) == [3]
+    assert _ids(single_char) == [4]
+
+
+def test_filters_are_combined(snapshot):
+    _, body = snapshot.query(ProductFilter(title__ilike="jacket", category__ilike="women"))
+
+    assert _ids(body) == [5]
+
+
+def test_search_matches_any_text_field(snapshot):
+    _, body = snapshot.query(ProductFilter(search="wedding"))
+    _, by_category = snapshot.query(ProductFilter(search="electronics"))
+
+    assert _ids(body) == [3]
+    assert _ids(by_category) == [4]
+
+
+def test_ordering_by_single_and_multiple_fields(snapshot):
+    _, by_price = snapshot.query(ProductFilter(order_by=["-price"]))
+    _, composite = snapshot.query(ProductFilter(order_by=["category", "-price"]))
+
+    assert _ids(by_price) == [3, 4, 1, 5, 2]
+    assert _ids(composite) == [4, 3, 1, 2, 5]
+
+
+def test_filtered_and_ordered_page(snapshot):
+    total, body = snapshot.query(ProductFilter(category__ilike="clothing", order_by=["price"]), skip=1, limit=1)
+
+    assert total == 3
+    assert _ids(body) == [5]
+
+
+def test_unsupported_ordering_is_rejected(snapshot):
+    with pytest.raises(Exception) as error:
+        snapshot.query(ProductFilter(order_by=["image"]))
+
+    assert error.value.status_code == 400
+
+
+def test_no_match_returns_empty_page(snapshot):
+    total, body = snapshot.query(ProductFilter(title__ilike="nonexistent"))
+
+    assert total == 0
+    assert body == "[]"
@@ -0,0 +1,77 @@
+from email.utils import formatdate
+
+import pytest
+from starlette.requests import Request
+
+from api.v1.fakestoreapi.controller import _cached_response, _not_modified
+from api.v1.fakestoreapi.services.redis import CacheEntry
+
+
+LAST_MODIFIED = 1_790_000_000.5
+ENTRY = CacheEntry({"etag": '"7-abc"', "last_modified": LAST_MODIFIED}, '[{"id_api":1}]')
+
+
+def _request(**headers) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+@pytest.mark.parametrize("if_none_match", ['"7-abc"', 'W/"7-abc"', '"old", "7-abc"', "*"])
+def test_matching_etag_is_not_modified(if_none_match):
+    assert _not_modified(ENTRY, _request(if_none_match=if_none_match))
+
+
+@pytest.mark.parametrize("if_none_match", ['"6-abc"', '"old", W/"other"', "7-abc"])
+def test_different_etag_is_modified(if_none_match):
+    assert not _not_modified(ENTRY, _request(if_none_match=if_none_match))
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    request = _request(if_none_match='"other"', if_modified_since=formatdate(LAST_MODIFIED + 60, usegmt=True))
+
+    assert not _not_modified(ENTRY, request)
+
+
+def test_entry_without_etag_never_matches_if_none_match():
+    entry = CacheEntry({"last_modified": LAST_MODIFIED}, "[]")
+
+    assert not _not_modified(entry, _request(if_none_match="*"))
+
+
+def test_if_modified_since_compares_with_second_precision():
+    # Last-Modified é enviado em segundos: a mesma data devolvida pelo cliente não é "modificada"
+    same_second = formatdate(LAST_MODIFIED, usegmt=True)
+    earlier = formatdate(LAST_MODIFIED - 1, usegmt=True)
+
+    assert _not_modified(ENTRY, _request(if_modified_since=same_second))
+    assert not _not_modified(ENTRY, _request(if_modified_since=earlier))
+
+
+@pytest.mark.parametrize("value", ["not a date", ""])
+def test_invalid_if_modified_since_is_ignored(value):
+    assert not _not_modified(ENTRY, _request(if_modified_since=value))
+
+
+def test_without_conditional_headers_is_modified():
+    assert not _not_modified(ENTRY, _request())
+
+
+def test_cached_response_returns_304_without_body():
+    response = _cached_response(ENTRY, _request(if_none_match='"7-abc"'))
+
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == '"7-abc"'
+    assert response.headers["last-modified"] == formatdate(LAST_MODIFIED, usegmt=True)
+
+
+def test_cached_response_sends_the_cached_body():
+    response = _cached_response(ENTRY, _request())
+
+    assert response.status_code == 200
+    assert response.body == b'[{"id_api":1}]'
+    assert response.headers["content-type"] == "application/json"
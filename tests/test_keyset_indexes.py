@@ -0,0 +1,99 @@
+"""
+Confere com EXPLAIN que as consultas dos serviços de usuários e favoritos usam os
+índices parciais. As consultas são capturadas executando os próprios serviços, então
+o teste falha se elas deixarem de casar com o predicado dos índices.
+
+Precisa de um Postgres (fixture pg_session); sem TEST_DATABASE_URL é pulado.
+"""
+import uuid
+from datetime import datetime, timezone
+from typing import Any, List
+
+import pytest
+from sqlalchemy import text
+
+from api.utils.pagination import Explain, encode_cursor
+from api.v1._shared.schemas import CurrentUser
+from api.v1.favorite.service import FavoriteService
+from api.v1.user.service import UserService
+
+
+pytestmark = pytest.mark.anyio
+
+
+class RecordingSession:
+    """Repassa para a sessão real e guarda as consultas executadas pelo serviço."""
+
+    def __init__(self, session):
+        self.session = session
+        self.statements: List[Any] = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return await self.session.execute(statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return await self.session.scalar(statement, *args, **kwargs)
+
+
+@pytest.fixture
+async def db(pg_session):
+    # Em tabelas vazias o seq scan sempre ganha; aqui interessa se o índice é elegível
+    await pg_session.execute(text("SET enable_seqscan = off"))
+    return RecordingSession(pg_session)
+
+
+def _user(*permissions: str) -> CurrentUser:
+    return CurrentUser(id=uuid.uuid4(), name="Teste", email="teste@example.com", permissions=list(permissions))
+
+
+def _cursor() -> str:
+    return encode_cursor(datetime.now(timezone.utc), uuid.uuid4())
+
+
+async def _index_names(db: RecordingSession) -> set:
+    assert len(db.statements) == 1
+    plan = (await db.session.execute(Explain(db.statements[0]))).scalar()
+
+    def walk(node):
+        if "Index Name" in node:
+            yield node["Index Name"]
+        for child in node.get("Plans", []):
+            yield from walk(child)
+
+    return set(walk(plan[0]["Plan"]))
+
+
+@pytest.mark.parametrize("cursor", [False, True])
+async def test_user_list_uses_keyset_index(db, cursor):
+    await UserService(db).list(cursor=_cursor() if cursor else None)
+
+    assert "ix_user_created_at_id" in await _index_names(db)
+
+
+@pytest.mark.parametrize("cursor", [False, True])
+async def test_favorite_list_by_user_uses_partial_index(db, cursor):
+    await FavoriteService(db).list(current_user=_user("USER"), cursor=_cursor() if cursor else None)
+
+    assert "ix_favorite_user_id_created_at_id" in await _index_names(db)
+
+
+@pytest.mark.parametrize("cursor", [False, True])
+async def test_admin_favorite_list_uses_keyset_index(db, cursor):
+    await FavoriteService(db).list(current_user=_user("ADMIN"), cursor=_cursor() if cursor else None)
+
+    assert "ix_favorite_created_at_id" in await _index_names(db)
+
+
+async def test_favorite_get_uses_primary_key(db):
+    with pytest.raises(Exception):
+        await FavoriteService(db).get(uuid.uuid4(), _user("USER"))
+
+    assert await _index_names(db) & {"favorite_pkey", "ix_favorite_id"}
+
+
+async def test_favorite_exists_uses_unique_partial_index(db):
+    await FavoriteService(db).favorite_exists(uuid.uuid4(), _user("USER"))
+
+    assert "ix_favorite_user_id_product_id" in await _index_names(db)
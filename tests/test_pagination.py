@@ -0,0 +1,135 @@
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from api.utils.pagination import Explain, build_page, count_rows, decode_cursor
+from api.v1._shared.models import User
+
+
+pytestmark = pytest.mark.anyio
+
+START = datetime(2026, 10, 17, 12, 0, tzinfo=timezone.utc)
+
+
+class Row(NamedTuple):
+    id: uuid.UUID
+    created_at: datetime
+
+
+def _rows(size: int):
+    # Ordem da listagem: created_at decrescente
+    return [Row(uuid.uuid4(), START - timedelta(minutes=position)) for position in range(size)]
+
+
+def _mapper(row: Row) -> str:
+    return str(row.id)
+
+
+def test_extra_row_means_there_is_a_next_page():
+    rows = _rows(4)
+
+    page = build_page(rows, 3, _mapper)
+
+    assert page.has_more
+    assert page.items == [str(row.id) for row in rows[:3]]
+    # O cursor aponta para o último item entregue, não para a linha extra
+    assert decode_cursor(page.next_cursor) == (rows[2].created_at, rows[2].id)
+
+
+@pytest.mark.parametrize("size", [0, 2, 3])
+def test_without_extra_row_there_is_no_next_page(size):
+    page = build_page(_rows(size), 3, _mapper)
+
+    assert not page.has_more
+    assert page.next_cursor is None
+    assert len(page.items) == size
+
+
+def test_offset_pagination_has_no_cursor():
+    page = build_page(_rows(4), 3, _mapper, keyset=False)
+
+    assert page.has_more
+    assert page.next_cursor is None
+
+
+def test_total_is_passed_through():
+    page = build_page(_rows(1), 3, _mapper, total=120, total_is_estimate=True)
+
+    assert page.total == 120
+    assert page.total_is_estimate
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+
+class FakeSession:
+    def __init__(self, plan=None, count=None):
+        self.plan = plan
+        self.count = count
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return FakeResult(self.plan)
+
+    async def scalar(self, statement):
+        self.statements.append(statement)
+        return self.count
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+QUERY = select(User).where(User.flg_deleted == False).order_by(User.created_at.desc())
+
+
+async def test_count_is_skipped_by_default():
+    db = FakeSession()
+
+    assert await count_rows(db, QUERY, None) == (None, False)
+    assert db.statements == []
+
+
+async def test_exact_count_runs_count_over_the_unordered_query():
+    db = FakeSession(count=42)
+
+    assert await count_rows(db, QUERY, "exact") == (42, False)
+    sql = _sql(db.statements[0])
+    assert sql.startswith("SELECT count(*)")
+    assert "ORDER BY" not in sql
+
+
+@pytest.mark.parametrize("as_text", [False, True])
+async def test_estimate_reads_planner_rows_without_scanning(as_text):
+    plan = [{"Plan": {"Node Type": "Seq Scan", "Plan Rows": 1234}}]
+    db = FakeSession(plan=json.dumps(plan) if as_text else plan)
+
+    assert await count_rows(db, QUERY, "estimate") == (1234, True)
+    statement = db.statements[0]
+    assert isinstance(statement, Explain)
+    assert "ORDER BY" not in _sql(statement)
+
+
+async def test_counts_against_postgres(pg_session):
+    pg_session.add_all([
+        User(name=f"Usuário {position}", email=f"user{position}@example.com", password="x", permissions=["USER"])
+        for position in range(3)
+    ])
+    await pg_session.commit()
+
+    exact, exact_is_estimate = await count_rows(pg_session, QUERY, "exact")
+    estimate, estimate_is_estimate = await count_rows(pg_session, QUERY, "estimate")
+
+    assert (exact, exact_is_estimate) == (3, False)
+    assert isinstance(estimate, int) and estimate_is_estimate
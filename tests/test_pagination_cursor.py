@@ -0,0 +1,58 @@
+import base64
+import json
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from api.utils.pagination import decode_cursor, encode_cursor
+
+
+CREATED_AT = datetime(2026, 10, 17, 12, 30, 15, 123456, tzinfo=timezone.utc)
+ID = uuid.UUID("6f1c1f0e-8c4b-4f5e-9f43-4d8a5b8c2a11")
+
+
+def _assert_rejected(cursor: str):
+    with pytest.raises(Exception) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+    assert error.value.detail == "Cursor de paginação inválido"
+
+
+def test_round_trip_keeps_position():
+    assert decode_cursor(encode_cursor(CREATED_AT, ID)) == (CREATED_AT, ID)
+
+
+def test_cursor_is_url_safe_and_unpadded():
+    cursor = encode_cursor(CREATED_AT, ID)
+
+    assert "=" not in cursor
+    assert set(cursor) <= set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_.")
+
+
+def test_tampered_payload_is_rejected():
+    encoded, signature = encode_cursor(CREATED_AT, ID).split(".")
+    payload = json.dumps({"c": "2000-01-01T00:00:00+00:00", "i": str(ID)}, separators=(",", ":")).encode()
+    forged = base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+    _assert_rejected(f"{forged}.{signature}")
+
+
+def test_tampered_signature_is_rejected():
+    encoded, signature = encode_cursor(CREATED_AT, ID).split(".")
+    flipped = ("A" if signature[0] != "A" else "B") + signature[1:]
+
+    _assert_rejected(f"{encoded}.{flipped}")
+
+
+def test_cursor_signed_with_another_key_is_rejected(monkeypatch):
+    monkeypatch.setattr("api.utils.pagination.JWT_SECRET_KEY", "another-secret")
+    cursor = encode_cursor(CREATED_AT, ID)
+    monkeypatch.undo()
+
+    _assert_rejected(cursor)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "abc.def", ".", "%%%.%%%"])
+def test_malformed_cursor_is_rejected(cursor):
+    _assert_rejected(cursor)
@@ -0,0 +1,66 @@
+import threading
+
+import anyio
+import pytest
+from fastapi import HTTPException
+
+from api.utils import security
+from api.utils.password_pool import PASSWORD_HASH_RETRY_AFTER, PasswordHasherPool
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def saturated_pool():
+    """Pool com 1 worker e 1 vaga na fila, ambos ocupados por operações bloqueadas."""
+    pool = PasswordHasherPool(workers=1, max_queue=1)
+    release = threading.Event()
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(2):
+            tg.start_soon(pool.run, release.wait)
+        while pool.in_flight < 2:
+            await anyio.sleep(0.01)
+
+        yield pool
+
+        release.set()
+
+    pool.shutdown()
+
+
+async def test_saturated_pool_rejects_with_429(saturated_pool):
+    with pytest.raises(HTTPException) as error:
+        await saturated_pool.run(lambda: "não executa")
+
+    assert error.value.status_code == 429
+    assert error.value.headers == {"Retry-After": str(PASSWORD_HASH_RETRY_AFTER)}
+    assert saturated_pool.stats()["queued"] == 1
+    assert saturated_pool.rejected == 1
+
+
+async def test_password_hash_is_rejected_while_pool_is_saturated(saturated_pool, monkeypatch):
+    monkeypatch.setattr(security, "password_pool", saturated_pool)
+
+    with pytest.raises(HTTPException) as error:
+        await security.get_password_hash_async("senha")
+
+    assert error.value.status_code == 429
+
+
+async def test_pool_accepts_again_after_draining():
+    pool = PasswordHasherPool(workers=1, max_queue=0)
+    release = threading.Event()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(pool.run, release.wait)
+        while pool.in_flight < 1:
+            await anyio.sleep(0.01)
+        with pytest.raises(HTTPException):
+            await pool.run(lambda: None)
+        release.set()
+
+    assert await pool.run(lambda: "ok") == "ok"
+    assert (pool.completed, pool.rejected, pool.in_flight) == (2, 1, 0)
+    pool.shutdown()
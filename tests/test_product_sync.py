@@ -0,0 +1,131 @@
+from typing import List, NamedTuple
+
+from sqlalchemy.sql import Select, Update
+from sqlalchemy.sql.dml import Insert
+
+from api.v1._shared.schemas import ProductCreate
+from api.v1.fakestoreapi.mapper import mapper_product_to_content_hash
+from api.v1.fakestoreapi.services.produto_sync import ProductServiceSync
+
+
+class Row(NamedTuple):
+    id_api: int
+    content_hash: str
+    flg_deleted: bool
+
+
+class FakeSession:
+    """Session mínima: devolve as linhas existentes no SELECT e registra as gravações."""
+
+    def __init__(self, existing: List[Row]):
+        self.existing = existing
+        self.upserted: List[dict] = []
+        self.tombstoned: List[int] = []
+        self.commits = 0
+
+    def execute(self, statement, params=None):
+        if isinstance(statement, Select):
+            return iter(self.existing)
+        if isinstance(statement, Insert):
+            self.upserted.extend(params)
+        elif isinstance(statement, Update):
+            self.tombstoned.extend(statement.compile().params["id_api_1"])
+        return None
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+
+def _product(id_api: int, price: float = 10.0) -> ProductCreate:
+    return ProductCreate(
+        id_api=id_api,
+        title=f"Produto {id_api}",
+        price=price,
+        description="",
+        category="test",
+        image="https://example.com/image.jpg",
+        rate=4.0,
+        count=1,
+    )
+
+
+def _row(product: ProductCreate, flg_deleted: bool = False) -> Row:
+    return Row(product.id_api, mapper_product_to_content_hash(product), flg_deleted)
+
+
+def test_classifies_inserted_updated_unchanged_and_tombstoned():
+    db = FakeSession([
+        _row(_product(1)),
+        _row(_product(2, price=10.0)),
+        _row(_product(3)),
+        _row(_product(4), flg_deleted=True),
+        _row(_product(5)),
+    ])
+
+    result = ProductServiceSync(db).sync_catalog([
+        _product(1),
+        _product(2, price=12.5),
+        _product(4),
+        _product(6),
+    ])
+
+    assert result.counts() == {"inserted": 1, "updated": 2, "unchanged": 1, "tombstoned": 2}
+    assert sorted(row["id_api"] for row in db.upserted) == [2, 4, 6]
+    assert sorted(db.tombstoned) == [3, 5]
+    assert db.commits == 1
+
+
+def test_content_hash_detects_changes_in_any_upstream_field():
+    original = _product(1)
+    changed = original.model_copy(update={"description": "nova descrição"})
+
+    assert mapper_product_to_content_hash(original) == mapper_product_to_content_hash(_product(1))
+    assert mapper_product_to_content_hash(original) != mapper_product_to_content_hash(changed)
+
+    db = FakeSession([_row(original)])
+    result = ProductServiceSync(db).sync_catalog([changed])
+
+    assert result.updated == 1
+    assert db.upserted[0]["content_hash"] == mapper_product_to_content_hash(changed)
+
+
+def test_unchanged_catalog_writes_nothing():
+    products = [_product(1), _product(2)]
+    db = FakeSession([_row(product) for product in products])
+
+    result = ProductServiceSync(db).sync_catalog(products)
+
+    assert result.counts() == {"inserted": 0, "updated": 0, "unchanged": 2, "tombstoned": 0}
+    assert db.upserted == []
+    assert db.tombstoned == []
+
+
+def test_empty_upstream_catalog_does_not_tombstone_everything():
+    db = FakeSession([_row(_product(1)), _row(_product(2))])
+
+    result = ProductServiceSync(db).sync_catalog([])
+
+    assert result.tombstoned == []
+    assert db.tombstoned == []
+
+
+def test_partial_sync_never_tombstones():
+    db = FakeSession([_row(_product(1)), _row(_product(2))])
+
+    result = ProductServiceSync(db).sync_catalog([_product(1, price=99.0)], tombstone_missing=False)
+
+    assert result.updated == 1
+    assert result.tombstoned == []
+
+
+def test_repeated_id_api_is_written_once_with_the_last_version():
+    db = FakeSession([])
+
+    result = ProductServiceSync(db).sync_catalog([_product(7, price=1.0), _product(7, price=2.0)])
+
+    assert result.inserted == 1
+    assert len(db.upserted) == 1
+    assert db.upserted[0]["price"] == 2.0
@@ -0,0 +1,102 @@
+"""
+Número de consultas por operação: assert_max_queries falha o teste quando um
+caminho passa a executar uma consulta por item (N+1).
+"""
+import pytest
+from sqlalchemy import create_engine, text
+
+from api.utils.db_metrics import assert_max_queries, count_queries, instrument_engine
+from api.v1._shared.models import Favorite, Product, User
+from api.v1._shared.schemas import CurrentUser
+from api.v1.favorite.service import FavoriteService
+
+
+@pytest.fixture
+def sqlite_connection():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    with engine.connect() as conn:
+        yield conn
+    engine.dispose()
+
+
+def test_assert_max_queries_reports_the_extra_statements(sqlite_connection):
+    with pytest.raises(AssertionError) as error:
+        with assert_max_queries(1):
+            for position in range(3):
+                sqlite_connection.execute(text(f"SELECT {position}"))
+
+    message = str(error.value)
+    assert "executadas 3" in message
+    assert "SELECT 2" in message
+
+
+def test_nested_scopes_count_in_the_outer_scope_without_keeping_sql(sqlite_connection):
+    with count_queries() as request:
+        with assert_max_queries(2) as block:
+            sqlite_connection.execute(text("SELECT 1"))
+        sqlite_connection.execute(text("SELECT 2"))
+
+    assert (block.count, request.count) == (1, 2)
+    assert block.statements == ["SELECT 1"]
+    # O contador das requisições não guarda o SQL
+    assert request.statements is None
+
+
+@pytest.fixture
+async def favorites(pg_session):
+    user = User(name="Cliente", email="cliente@example.com", password="x", permissions=["USER"])
+    products = [
+        Product(
+            id_api=position,
+            title=f"Produto {position}",
+            price=10.0,
+            description="",
+            category="test",
+            image="https://example.com/image.jpg",
+            rate=4.0,
+            count=1,
+        )
+        for position in range(5)
+    ]
+    pg_session.add(user)
+    pg_session.add_all(products)
+    await pg_session.flush()
+    favorites = [Favorite(user_id=user.id, product_id=product.id, review="ok") for product in products]
+    pg_session.add_all(favorites)
+    await pg_session.commit()
+
+    current_user = CurrentUser(id=user.id, name=user.name, email=user.email, permissions=["USER"])
+    return current_user, favorites
+
+
+@pytest.mark.anyio
+async def test_favorite_list_runs_a_single_query(pg_session, favorites):
+    current_user, _ = favorites
+
+    with assert_max_queries(1):
+        page = await FavoriteService(pg_session).list(current_user=current_user, limit=10)
+
+    assert len(page.items) == 5
+    assert {item.title for item in page.items} == {f"Produto {position}" for position in range(5)}
+
+
+@pytest.mark.anyio
+async def test_favorite_get_runs_a_single_query(pg_session, favorites):
+    current_user, items = favorites
+
+    with assert_max_queries(1):
+        favorite = await FavoriteService(pg_session).get(items[0].id, current_user)
+
+    assert favorite.id == items[0].id
+
+
+@pytest.mark.anyio
+async def test_per_item_lookups_are_caught_as_n_plus_one(pg_session, favorites):
+    current_user, items = favorites
+    service = FavoriteService(pg_session)
+
+    with pytest.raises(AssertionError):
+        with assert_max_queries(1):
+            for favorite in items:
+                await service.get(favorite.id, current_user)
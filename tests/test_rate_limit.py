@@ -0,0 +1,86 @@
+import pytest
+
+from api.utils.rate_limit import SlidingWindowRateLimiter
+
+
+pytestmark = pytest.mark.anyio
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("api.utils.rate_limit.time.time", clock)
+    return clock
+
+
+async def test_allows_up_to_the_limit_then_rejects(redis, clock):
+    limiter = SlidingWindowRateLimiter("test", limit=3, window=60, client=redis)
+
+    for _ in range(3):
+        assert await limiter.hit("1.2.3.4") is None
+        clock.now += 1
+
+    # Quarta tentativa em t+3: a primeira (t) sai da janela em 57 s
+    assert await limiter.hit("1.2.3.4") == 57
+    assert limiter.rejected == 1
+
+
+async def test_identifiers_are_limited_separately(redis, clock):
+    limiter = SlidingWindowRateLimiter("test", limit=1, window=60, client=redis)
+
+    assert await limiter.hit("a") is None
+    assert await limiter.hit("b") is None
+    assert await limiter.hit("a") is not None
+
+
+async def test_window_slides(redis, clock):
+    limiter = SlidingWindowRateLimiter("test", limit=2, window=60, client=redis)
+
+    assert await limiter.hit("ip") is None
+    clock.now += 30
+    assert await limiter.hit("ip") is None
+    assert await limiter.hit("ip") == 30
+
+    # A primeira tentativa sai da janela: libera exatamente uma nova
+    clock.now += 31
+    assert await limiter.hit("ip") is None
+    assert await limiter.hit("ip") is not None
+
+
+async def test_rejected_attempts_do_not_extend_the_block(redis, clock):
+    limiter = SlidingWindowRateLimiter("test", limit=1, window=60, client=redis)
+
+    assert await limiter.hit("ip") is None
+    for _ in range(10):
+        clock.now += 5
+        assert await limiter.hit("ip") is not None
+
+    clock.now += 11
+    assert await limiter.hit("ip") is None
+
+
+async def test_key_expires_with_the_window(redis, clock):
+    limiter = SlidingWindowRateLimiter("test", limit=5, window=60, client=redis)
+
+    await limiter.hit("ip")
+
+    assert 0 < await redis.ttl("ratelimit:test:ip") <= 60
+
+
+async def test_redis_failure_allows_the_request(clock):
+    class Unavailable:
+        def pipeline(self, *args, **kwargs):
+            raise ConnectionError("redis down")
+
+    limiter = SlidingWindowRateLimiter("test", limit=1, window=60, client=Unavailable())
+
+    assert await limiter.hit("ip") is None
+    assert await limiter.hit("ip") is None
@@ -0,0 +1,24 @@
+import logging
+
+import pytest
+
+from api.utils.resources import AppResources
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_failed_warmup_step_reports_only_its_name(caplog):
+    resources = AppResources()
+
+    async def fail():
+        raise ConnectionError("could not connect to postgres://admin:secret@db:5432")
+
+    with caplog.at_level(logging.WARNING):
+        await resources._run_step("db", fail)
+    status = resources.status()
+
+    assert status["warmup_failed_steps"] == ["db"]
+    assert "secret" not in repr(status)
+    # O detalhe continua disponível nos logs
+    assert "secret" in caplog.text
@@ -0,0 +1,160 @@
+import asyncio
+
+import pytest
+
+from api.utils.single_flight import SingleFlight
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_calls_share_the_leader_result():
+    single_flight = SingleFlight(mode="local", name="test")
+    calls = 0
+    release = asyncio.Event()
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "value"
+
+    tasks = [asyncio.create_task(single_flight.do("key", fetch)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*tasks) == ["value"] * 5
+    assert calls == 1
+    assert single_flight.stats() == {
+        "leader_calls": 1,
+        "coalesced_calls": 4,
+        "remote_coalesced_calls": 0,
+        "in_flight": 0,
+    }
+
+
+async def test_different_keys_run_independently():
+    single_flight = SingleFlight(mode="local", name="test")
+
+    async def fetch(value):
+        await asyncio.sleep(0)
+        return value
+
+    results = await asyncio.gather(
+        single_flight.do("a", lambda: fetch("a")),
+        single_flight.do("b", lambda: fetch("b")),
+    )
+
+    assert results == ["a", "b"]
+    assert single_flight.leader_calls == 2
+
+
+async def test_leader_error_is_shared_with_followers():
+    single_flight = SingleFlight(mode="local", name="test")
+    release = asyncio.Event()
+
+    async def fail():
+        await release.wait()
+        raise RuntimeError("upstream down")
+
+    tasks = [asyncio.create_task(single_flight.do("key", fail)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    # A chave é liberada: a próxima chamada executa de novo
+    assert await single_flight.do("key", lambda: asyncio.sleep(0, "ok")) == "ok"
+
+
+async def test_leader_cancellation_does_not_cancel_followers():
+    single_flight = SingleFlight(mode="local", name="test")
+    calls = 0
+    release = asyncio.Event()
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return calls
+
+    leader = asyncio.create_task(single_flight.do("key", fetch))
+    await asyncio.sleep(0)
+    followers = [asyncio.create_task(single_flight.do("key", fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    # Seguidores acordam com LeaderCancelled e elegem um novo líder antes da busca terminar
+    for _ in range(3):
+        await asyncio.sleep(0)
+    release.set()
+
+    # Um dos seguidores assume como líder e os demais recebem o resultado dele
+    assert await asyncio.gather(*followers) == [2, 2, 2]
+    assert calls == 2
+
+
+async def test_follower_cancellation_does_not_cancel_leader():
+    single_flight = SingleFlight(mode="local", name="test")
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return "value"
+
+    leader = asyncio.create_task(single_flight.do("key", fetch))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(single_flight.do("key", fetch))
+    await asyncio.sleep(0)
+
+    follower.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await leader == "value"
+    with pytest.raises(asyncio.CancelledError):
+        await follower
+
+
+async def test_redis_mode_waits_for_the_remote_leader_result(redis, monkeypatch):
+    monkeypatch.setattr("api.utils.single_flight.SINGLE_FLIGHT_POLL_INTERVAL", 0.01)
+    single_flight = SingleFlight(mode="redis", name="test")
+    # Outro worker já é o líder e publicará o resultado no cache
+    await redis.set("singleflight:key", "other-worker", px=10000)
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        return "local"
+
+    async def publish():
+        await asyncio.sleep(0.03)
+        await redis.set("cache:key", "remote")
+        await redis.delete("singleflight:key")
+
+    publisher = asyncio.create_task(publish())
+    result = await single_flight.do("key", fetch, redis=redis, wait_result=lambda: redis.get("cache:key"))
+    await publisher
+
+    assert result == "remote"
+    assert calls == 0
+    assert single_flight.remote_coalesced_calls == 1
+
+
+async def test_redis_mode_fetches_when_the_remote_leader_gives_up(redis, monkeypatch):
+    monkeypatch.setattr("api.utils.single_flight.SINGLE_FLIGHT_POLL_INTERVAL", 0.01)
+    single_flight = SingleFlight(mode="redis", name="test")
+    # Lock expira sem resultado publicado: o líder remoto falhou
+    await redis.set("singleflight:key", "other-worker", px=30)
+
+    async def fetch():
+        return "local"
+
+    async def nothing():
+        return None
+
+    assert await single_flight.do("key", fetch, redis=redis, wait_result=nothing) == "local"
+    assert single_flight.leader_calls == 1
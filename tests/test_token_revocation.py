@@ -0,0 +1,95 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from api.utils import security
+from api.utils.security import create_access_token, get_current_user, is_token_revoked
+from api.utils.token_version import TokenVersionStore, TokenVersionUnavailable
+
+
+pytestmark = pytest.mark.anyio
+
+USER_ID = uuid.uuid4()
+
+
+class UnavailableRedis:
+    def __getattr__(self, name):
+        raise ConnectionError("redis down")
+
+
+@pytest.fixture
+def versions(redis, monkeypatch):
+    store = TokenVersionStore(redis)
+    monkeypatch.setattr(security, "token_versions", store)
+    return store
+
+
+async def test_new_tokens_stay_valid_until_bump(versions):
+    version = await versions.current(USER_ID)
+    payload = {"sub": str(USER_ID), "ver": version}
+
+    assert await versions.current(USER_ID) == version
+    assert not await is_token_revoked(payload)
+
+    await versions.bump(USER_ID)
+
+    assert await is_token_revoked(payload)
+
+
+async def test_missing_version_key_counts_as_revoked(versions, redis):
+    payload = {"sub": str(USER_ID), "ver": await versions.current(USER_ID)}
+
+    await redis.flushall()
+
+    assert await is_token_revoked(payload)
+    # A versão recriada depois do flush é maior que qualquer uma já emitida
+    assert await versions.bump(USER_ID) > payload["ver"]
+
+
+async def test_redis_failure_raises_instead_of_guessing(monkeypatch):
+    store = TokenVersionStore(UnavailableRedis())
+    monkeypatch.setattr(security, "token_versions", store)
+
+    with pytest.raises(TokenVersionUnavailable):
+        await is_token_revoked({"sub": str(USER_ID), "ver": 1})
+    with pytest.raises(TokenVersionUnavailable):
+        await store.bump(USER_ID)
+
+
+async def test_legacy_tokens_are_rejected_without_cutover(versions, monkeypatch):
+    monkeypatch.setattr(security, "TOKEN_LEGACY_ACCEPT_UNTIL", None)
+
+    assert await is_token_revoked({"sub": str(USER_ID)})
+
+
+async def test_legacy_tokens_are_accepted_only_until_cutover(versions, monkeypatch):
+    now = datetime.now(timezone.utc)
+
+    monkeypatch.setattr(security, "TOKEN_LEGACY_ACCEPT_UNTIL", now + timedelta(hours=1))
+    assert not await is_token_revoked({"sub": str(USER_ID)})
+
+    monkeypatch.setattr(security, "TOKEN_LEGACY_ACCEPT_UNTIL", now - timedelta(seconds=1))
+    assert await is_token_revoked({"sub": str(USER_ID)})
+
+
+async def test_get_current_user_rejects_revoked_token(versions):
+    version = await versions.current(USER_ID)
+    token = create_access_token({"sub": str(USER_ID), "ver": version})
+    await versions.bump(USER_ID)
+
+    with pytest.raises(Exception) as error:
+        await get_current_user(token, db=None)
+
+    assert error.value.status_code == 401
+
+
+async def test_get_current_user_fails_closed_when_redis_is_down(monkeypatch):
+    monkeypatch.setattr(security, "token_versions", TokenVersionStore(UnavailableRedis()))
+    token = create_access_token({"sub": str(USER_ID), "ver": 1})
+
+    # db=None: a requisição é recusada antes de qualquer consulta
+    with pytest.raises(Exception) as error:
+        await get_current_user(token, db=None)
+
+    assert error.value.status_code == 503
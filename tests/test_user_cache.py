@@ -0,0 +1,180 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from api.utils.user_cache import UserPrincipalCache
+from api.v1._shared.models import User
+from api.v1._shared.schemas import CurrentUser, UserDelete, UserUpdate
+from api.v1.user import service as user_service
+from api.v1.user.service import UserService
+
+
+pytestmark = pytest.mark.anyio
+
+
+class Clock:
+    def __init__(self, now: float = 1_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class UnavailableRedis:
+    def __getattr__(self, name):
+        raise ConnectionError("redis down")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("api.utils.user_cache.time.monotonic", clock)
+    monkeypatch.setattr("api.utils.user_cache.USER_CACHE_TTL", 30)
+    return clock
+
+
+@pytest.fixture
+def redis_tier(monkeypatch):
+    monkeypatch.setattr("api.utils.user_cache.USER_CACHE_REDIS_ENABLED", True)
+
+
+def _principal(name: str = "Cliente") -> CurrentUser:
+    return CurrentUser(id=uuid.uuid4(), name=name, email=f"{name}@example.com", permissions=["USER"])
+
+
+async def test_local_entry_expires_after_ttl(clock):
+    cache = UserPrincipalCache()
+    user = _principal()
+    await cache.set(user)
+
+    clock.now += 29
+    assert await cache.get(user.id) == user
+
+    clock.now += 2
+    assert await cache.get(user.id) is None
+    assert cache.stats()["size"] == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+async def test_evicts_least_recently_used_at_capacity(clock, monkeypatch):
+    monkeypatch.setattr("api.utils.user_cache.USER_CACHE_MAX_SIZE", 2)
+    cache = UserPrincipalCache()
+    first, second, third = _principal("a"), _principal("b"), _principal("c")
+
+    await cache.set(first)
+    await cache.set(second)
+    # Leitura torna o primeiro o mais recente: o segundo é o despejado
+    assert await cache.get(first.id) == first
+    await cache.set(third)
+
+    assert cache.stats()["size"] == 2
+    assert await cache.get(second.id) is None
+    assert await cache.get(first.id) == first
+    assert await cache.get(third.id) == third
+
+
+async def test_invalidate_removes_local_entry(clock):
+    cache = UserPrincipalCache()
+    user = _principal()
+    await cache.set(user)
+
+    await cache.invalidate(user.id)
+
+    assert await cache.get(user.id) is None
+
+
+async def test_redis_tier_is_shared_between_workers(clock, redis, redis_tier):
+    worker, other_worker = UserPrincipalCache(redis), UserPrincipalCache(redis)
+    user = _principal()
+    await worker.set(user)
+
+    assert await other_worker.get(user.id) == user
+    assert other_worker.redis_hits == 1
+    # Promovido ao nível local: a próxima leitura não vai ao Redis
+    assert await other_worker.get(user.id) == user
+    assert other_worker.hits == 1
+
+    await worker.invalidate(user.id)
+
+    assert await redis.get(f"principal:{user.id}") is None
+    assert await UserPrincipalCache(redis).get(user.id) is None
+
+
+async def test_redis_failure_falls_back_to_local_tier(clock, redis_tier):
+    cache = UserPrincipalCache(UnavailableRedis())
+    user = _principal()
+
+    await cache.set(user)
+    assert await cache.get(user.id) == user
+
+    await cache.invalidate(user.id)
+    assert await cache.get(user.id) is None
+    assert cache.misses == 1
+
+
+class FakeResult:
+    def __init__(self, user):
+        self.user = user
+
+    def scalar_one_or_none(self):
+        return self.user
+
+
+class FakeSession:
+    def __init__(self, user):
+        self.user = user
+
+    async def execute(self, query):
+        return FakeResult(self.user)
+
+    async def commit(self):
+        pass
+
+    async def refresh(self, obj):
+        pass
+
+
+@pytest.fixture
+def stored_user(clock, monkeypatch):
+    cache = UserPrincipalCache()
+    monkeypatch.setattr(user_service, "user_cache", cache)
+
+    async def revoke_tokens(user_id):
+        pass
+
+    async def verify_password_async(password, hashed):
+        return True
+
+    monkeypatch.setattr(user_service, "revoke_tokens", revoke_tokens)
+    monkeypatch.setattr(user_service, "verify_password_async", verify_password_async)
+
+    now = datetime.now(timezone.utc)
+    user = User(
+        id=uuid.uuid4(),
+        name="Cliente",
+        email="cliente@example.com",
+        password="hash",
+        permissions=["USER"],
+        created_at=now,
+        updated_at=now,
+    )
+    return cache, user
+
+
+async def test_user_update_invalidates_cached_principal(stored_user):
+    cache, user = stored_user
+    await cache.set(CurrentUser(id=user.id, name=user.name, email=user.email, permissions=user.permissions))
+
+    await UserService(FakeSession(user)).update(UserUpdate(id=user.id, name="Novo nome"))
+
+    assert await cache.get(user.id) is None
+
+
+async def test_user_delete_invalidates_cached_principal(stored_user):
+    cache, user = stored_user
+    await cache.set(CurrentUser(id=user.id, name=user.name, email=user.email, permissions=user.permissions))
+
+    await UserService(FakeSession(user)).delete(UserDelete(id=user.id, password="senha"))
+
+    assert await cache.get(user.id) is None